@@ -0,0 +1,95 @@
+"""
+Memory benchmark for the `forward_selection` hot loop.
+
+Compares the preallocated workspace used by `forward_selection` with
+the previous implementation, which built a DataFrame of scores every
+step and a fancy-indexed copy of the selected columns for every
+candidate. Each run happens in a fresh process so that the peak RSS of
+one run does not hide the other.
+
+Usage::
+
+    poetry run python benchmarks/bench_forward_selection_memory.py
+"""
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from feature_selection import forward_selection
+
+SHAPES = [(2000, 500), (2000, 2000), (500, 10000)]
+MAX_FEATURES = 10
+
+
+def scorer(X, y):
+    # Cheap, allocation-free scorer so the selector's overhead dominates
+    return 1 / (1 + abs(X[:, -1] @ y) + X.shape[1])
+
+
+def reference_forward_selection(scorer, X, y, max_features):
+    """
+    The previous hot loop: a fresh copy per candidate and a DataFrame
+    per step.
+    """
+    ftr_select = []
+    ftr_no_select = list(range(0, X.shape[1]))
+
+    for j in range(0, max_features):
+        fn_score = [scorer(X[:, ftr_select + [i]], y) for i in ftr_no_select]
+        df = pd.DataFrame({'number': ftr_no_select, 'fn_score': fn_score})
+        x = int(df[df.fn_score == df.fn_score.min()].number.iloc[0])
+        ftr_select.append(x)
+        ftr_no_select.remove(x)
+
+    return ftr_select
+
+
+def measure(implementation, n_samples, n_features, queue):
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((n_samples, n_features))
+    y = rng.standard_normal(n_samples)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    if implementation == 'reference':
+        reference_forward_selection(scorer, X, y, MAX_FEATURES)
+    else:
+        forward_selection(scorer, X, y, MAX_FEATURES, MAX_FEATURES)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((peak, rss_after - rss_before))
+
+
+def run(implementation, n_samples, n_features):
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(
+        implementation, n_samples, n_features, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    print(f'{"shape":>14} {"implementation":>15} '
+          f'{"traced peak (MiB)":>18} {"RSS growth (MiB)":>17}')
+
+    for n_samples, n_features in SHAPES:
+        for implementation in ['reference', 'workspace']:
+            peak, rss = run(implementation, n_samples, n_features)
+            # ru_maxrss is in bytes on macOS and in KiB elsewhere
+            rss_mib = rss / 2 ** 20 if sys.platform == 'darwin' \
+                else rss / 2 ** 10
+            print(f'{n_samples:>6} x {n_features:<5} {implementation:>15} '
+                  f'{peak / 2 ** 20:>18.2f} {rss_mib:>17.2f}')
+
+
+if __name__ == '__main__':
+    main()
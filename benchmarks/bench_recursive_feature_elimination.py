@@ -0,0 +1,78 @@
+"""
+Overhead benchmark for `recursive_feature_elimination`.
+
+Compares the index-mask engine, which hands the scorer views of a
+working array, with the previous implementation, which rebuilt the
+remaining matrix with `DataFrame.drop` every round and the kept list
+with a quadratic `reduce`. The scorer is nearly free so that the time
+measured is the selector's own overhead.
+
+Usage::
+
+    poetry run python benchmarks/bench_recursive_feature_elimination.py
+"""
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from feature_selection import recursive_feature_elimination
+
+# (n_samples, n_features, n_features_to_select)
+SHAPES = [(200, 1000, 10), (200, 10000, 9000)]
+
+
+def scorer(X, y):
+    # Eliminate the column with the smallest first value
+    return X.columns[X.iloc[0].to_numpy().argmin()]
+
+
+def reference_recursive_feature_elimination(scorer, X, y,
+                                            n_features_to_select):
+    """
+    The previous implementation: a `drop` per round.
+    """
+    all_features = pd.DataFrame(X)
+    eliminated_features = []
+
+    for i in range(1, X.shape[1]):
+        features_to_try = all_features.drop(columns=eliminated_features)
+        eliminated_features.append(scorer(features_to_try, y))
+
+        if len(eliminated_features) + n_features_to_select >= X.shape[1]:
+            break
+
+    eliminated_features = set(eliminated_features)
+
+    return reduce(
+        lambda acc, col: acc if col in eliminated_features else acc + [col],
+        all_features.columns, [])
+
+
+def main():
+    print(f'{"shape":>14} {"rounds":>7} {"implementation":>15} '
+          f'{"seconds":>9}')
+
+    for n_samples, n_features, n_features_to_select in SHAPES:
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((n_samples, n_features))
+        y = rng.standard_normal(n_samples)
+        rounds = n_features - n_features_to_select
+        results = {}
+
+        for implementation, function in [
+                ('reference', reference_recursive_feature_elimination),
+                ('index mask', recursive_feature_elimination)]:
+            start = time.perf_counter()
+            results[implementation] = function(scorer, X, y,
+                                               n_features_to_select)
+            elapsed = time.perf_counter() - start
+            print(f'{n_samples:>6} x {n_features:<5} {rounds:>7} '
+                  f'{implementation:>15} {elapsed:>9.3f}')
+
+        assert results['reference'] == results['index mask']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark suite covering every selector across data shapes.
+
+Runs `forward_selection`, `recursive_feature_elimination`,
+`simulated_annealing` and `variance_thresholding` on `make_friedman1`
+datasets over a grid of rows x columns, with a cheap scorer (so the
+selector's own overhead dominates) and an expensive one (a linear model
+fit per call). For every case it records the best wall-clock time over
+`--repeat` runs, the number of scorer calls and the traced peak memory
+of one extra instrumented run.
+
+Results are written as JSON so that two versions can be compared::
+
+    poetry run python benchmarks/bench_selectors.py --output before.json
+    git checkout <other version>
+    poetry run python benchmarks/bench_selectors.py --output after.json \\
+        --compare before.json
+
+`--quick` runs a smaller grid, e.g. to check the suite itself still works.
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression
+
+import feature_selection
+from feature_selection import ProfileCollector, forward_selection, \
+    recursive_feature_elimination, simulated_annealing, \
+    variance_thresholding
+
+# (n_samples, n_features)
+GRID = [(200, 10), (200, 100), (2000, 10), (2000, 100), (500, 1000)]
+QUICK_GRID = [(100, 10), (100, 50)]
+
+
+def cheap_scorer(X, y):
+    # Nearly free and allocation-light: a single dot product
+    X = np.asarray(X)
+    return 1 / (1 + abs(X[:, -1] @ y) + X.shape[1])
+
+
+def expensive_scorer(X, y):
+    model = LinearRegression().fit(X, y)
+    return 1 - model.score(X, y)
+
+
+def cheap_importances(X, y):
+    return np.abs(X.to_numpy().T @ y)
+
+
+def expensive_importances(X, y):
+    return np.abs(LinearRegression().fit(X, y).coef_)
+
+
+def run_forward_selection(scorer, X, y, callback=None):
+    forward_selection(scorer, X, y, 3, 6, callback=callback)
+
+
+def run_recursive_feature_elimination(scorer, X, y, callback=None):
+    recursive_feature_elimination(scorer, X, y, max(1, X.shape[1] // 10),
+                                  step=0.1, callback=callback)
+
+
+def run_simulated_annealing(scorer, X, y, callback=None):
+    simulated_annealing(scorer, X, y, iterations=50, random_state=0,
+                        callback=callback)
+
+
+def run_variance_thresholding(scorer, X, y, callback=None):
+    variance_thresholding(X, threshold=0.05)
+
+
+# (selector, scorer name, function running it, scorer)
+CASES = [
+    ('forward_selection', 'cheap', run_forward_selection, cheap_scorer),
+    ('forward_selection', 'expensive', run_forward_selection,
+     expensive_scorer),
+    ('recursive_feature_elimination', 'cheap',
+     run_recursive_feature_elimination, cheap_importances),
+    ('recursive_feature_elimination', 'expensive',
+     run_recursive_feature_elimination, expensive_importances),
+    ('simulated_annealing', 'cheap', run_simulated_annealing, cheap_scorer),
+    ('simulated_annealing', 'expensive', run_simulated_annealing,
+     expensive_scorer),
+    ('variance_thresholding', 'none', run_variance_thresholding, None),
+]
+
+
+def measure(run, scorer, X, y, repeat):
+    """
+    Return the best time over `repeat` runs, and the scorer calls and
+    traced peak memory of one instrumented run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(scorer, X, y)
+        times.append(time.perf_counter() - start)
+
+    profile = ProfileCollector()
+    tracemalloc.start()
+    run(scorer, X, y, profile)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(times), len(profile.calls), peak
+
+
+def environment():
+    return {
+        'feature_selection': feature_selection.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def case_key(result):
+    return (result['selector'], result['scorer'], result['n_samples'],
+            result['n_features'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', help='path of the JSON results')
+    parser.add_argument('--compare', help='JSON results of an earlier run '
+                        'to compare times against')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per case (default: 3)')
+    parser.add_argument('--selector', action='append',
+                        help='only run this selector (can be repeated)')
+    parser.add_argument('--quick', action='store_true',
+                        help='run a small grid')
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {case_key(result): result
+                        for result in json.load(f)['results']}
+
+    print(f'{"selector":>29} {"scorer":>9} {"shape":>12} {"seconds":>9} '
+          f'{"calls":>6} {"peak MiB":>9} {"vs base":>8}')
+
+    results = []
+    for n_samples, n_features in QUICK_GRID if args.quick else GRID:
+        X, y = make_friedman1(n_samples=n_samples, n_features=n_features,
+                              random_state=0)
+
+        for selector, scorer_name, run, scorer in CASES:
+            if args.selector and selector not in args.selector:
+                continue
+
+            seconds, calls, peak = measure(run, scorer, X, y, args.repeat)
+            result = {'selector': selector, 'scorer': scorer_name,
+                      'n_samples': n_samples, 'n_features': n_features,
+                      'seconds': seconds, 'scorer_calls': calls,
+                      'peak_bytes': peak}
+            results.append(result)
+
+            ratio = ''
+            if case_key(result) in baseline:
+                base = baseline[case_key(result)]['seconds']
+                ratio = f'{seconds / base:.2f}x'
+
+            print(f'{selector:>29} {scorer_name:>9} '
+                  f'{n_samples:>5} x {n_features:<4} {seconds:>9.4f} '
+                  f'{calls:>6} {peak / 2 ** 20:>9.2f} {ratio:>8}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f,
+                      indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,3 +5,10 @@ from feature_selection.simulated_annealing import simulated_annealing
 from feature_selection.recursive_feature_elimination \
     import recursive_feature_elimination
 from feature_selection.variance_thresholding import variance_thresholding
+from feature_selection.cache import ScoreCache
+from feature_selection.budget import Budget
+from feature_selection.profiling import ProfileCollector
+from feature_selection.filters import select_k_best
+from feature_selection.correlation_thresholding import \
+    correlation_thresholding
+from feature_selection.pipeline import SelectionPipeline
@@ -0,0 +1,37 @@
+import json
+import os
+
+
+def _save_checkpoint(path, selector, shape, state):
+    """
+    Atomically write the state of a selector run to `path` as JSON.
+
+    The file is written next to `path` first and then moved over it, so
+    an interrupted write never leaves a truncated checkpoint behind.
+    """
+    checkpoint = {'selector': selector, 'shape': list(shape), 'state': state}
+    tmp_path = f'{os.fspath(path)}.tmp'
+
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+
+    os.replace(tmp_path, path)
+
+
+def _load_checkpoint(path, selector, shape):
+    """
+    Read the state saved by `_save_checkpoint`, checking that it was
+    written by the same selector for data of the same shape.
+    """
+    with open(path) as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('selector') != selector:
+        raise ValueError(f'{os.fspath(path)} is not a {selector} '
+                         'checkpoint.')
+
+    if checkpoint.get('shape') != list(shape):
+        raise ValueError(f'{os.fspath(path)} was saved for data of shape '
+                         f'{tuple(checkpoint.get("shape"))}, not {shape}.')
+
+    return checkpoint['state']
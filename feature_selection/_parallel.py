@@ -0,0 +1,119 @@
+import os
+import pickle
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+_POOLS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+# Objects stored in a worker process by the pool initializer, by key
+_RESIDENT = {}
+
+
+class _Resident:
+    """
+    Mixin for objects, such as the data of a run, that tasks refer to
+    and that should be sent to each worker process once rather than with
+    every task.
+
+    While `_executor_scope` keeps a process pool it created for such an
+    object, pickling the object only pickles a key, and unpickling it in
+    a worker returns the copy the pool initializer stored under that
+    key. Otherwise it is pickled as usual.
+    """
+
+    _resident_key = None
+
+    def __reduce_ex__(self, protocol):
+        if self._resident_key is None:
+            return super().__reduce_ex__(protocol)
+
+        return _load_resident, (self._resident_key,)
+
+
+def _store_resident(key, payload):
+    _RESIDENT[key] = pickle.loads(payload)
+
+
+def _load_resident(key):
+    return _RESIDENT[key]
+
+
+def _effective_n_jobs(n_jobs):
+    """
+    Resolve `n_jobs` into a positive number of workers.
+
+    `None` means one worker and negative values count back from the
+    number of CPUs, so -1 uses every CPU.
+    """
+    if n_jobs is None:
+        return 1
+
+    if not isinstance(n_jobs, (int, np.integer)) or n_jobs == 0:
+        raise ValueError('n_jobs must be a non-zero integer or None.')
+
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+    return int(n_jobs)
+
+
+@contextmanager
+def _executor_scope(n_jobs=None, executor=None, resident=None):
+    """
+    Yield the executor that should run parallel work, or None when the
+    work should run serially in the calling thread.
+
+    `executor` is either an `concurrent.futures.Executor` instance,
+    which is used as is and left running, or one of 'thread' and
+    'process', in which case a pool of `n_jobs` workers is created and
+    shut down on exit.
+
+    A `_Resident` object given as `resident` is sent to each worker of
+    a process pool created here once, when the worker starts, instead
+    of with every task referring to it. Executors given as instances
+    receive it with every task.
+    """
+    if isinstance(executor, Executor):
+        yield executor
+        return
+
+    if executor is not None and executor not in _POOLS:
+        raise ValueError("executor must be an Executor, 'thread', "
+                         "'process' or None.")
+
+    n_workers = _effective_n_jobs(n_jobs)
+
+    if n_workers == 1:
+        yield None
+        return
+
+    if executor != 'process' or resident is None:
+        with _POOLS[executor or 'thread'](max_workers=n_workers) as pool:
+            yield pool
+        return
+
+    # Pickled before the key is set, so the workers get the object itself
+    key = uuid.uuid4().hex
+    payload = pickle.dumps(resident, pickle.HIGHEST_PROTOCOL)
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 initializer=_store_resident,
+                                 initargs=(key, payload)) as pool:
+            resident._resident_key = key
+            yield pool
+    finally:
+        resident.__dict__.pop('_resident_key', None)
+
+
+def _split(items, n_chunks):
+    """
+    Split `items` into at most `n_chunks` contiguous, ordered chunks.
+    """
+    n_chunks = max(1, min(n_chunks, len(items)))
+    bounds = np.linspace(0, len(items), n_chunks + 1).astype(int)
+    return [items[bounds[k]:bounds[k + 1]] for k in range(n_chunks)]
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy is optional, only needed for sparse inputs
+    sp = None
+
+
+def _open_npy(data):
+    """
+    Open a path to a `.npy` file as a read-only memory map, so that
+    selectors can work on arrays larger than memory. Any other input is
+    returned unchanged.
+    """
+    if isinstance(data, (str, os.PathLike)) and \
+            os.fspath(data).endswith('.npy'):
+        return np.load(data, mmap_mode='r')
+
+    return data
+
+
+def _is_sparse(data):
+    """
+    Whether `data` is a `scipy.sparse` matrix or array.
+    """
+    return sp is not None and sp.issparse(data)
+
+
+def _is_array_like(data):
+    """
+    Whether `data` is a NumPy array (including `np.memmap`), a Pandas
+    DataFrame or a `scipy.sparse` matrix.
+    """
+    return isinstance(data, (pd.DataFrame, np.ndarray)) or _is_sparse(data)
+
+
+def _column_block(data, columns, dtype=float):
+    """
+    Return the `columns` (a slice or an array of indexes) of a NumPy
+    array, memory map, DataFrame or `scipy.sparse` matrix as a dense
+    array of `dtype`, without copying anything but those columns. The
+    result may be a read-only view of `data`.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.iloc[:, columns].to_numpy(dtype=dtype)
+
+    if _is_sparse(data):
+        return data[:, columns].toarray().astype(dtype, copy=False)
+
+    return np.asarray(data[:, columns], dtype=dtype)
+
+
+def _take_columns(data, positions):
+    """
+    Return the columns of `data` at `positions`, in the same type as
+    `data`: `data` itself when all of them are kept in order, a view
+    when they are contiguous, and a copy of only those columns
+    otherwise.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    columns = positions
+
+    if len(positions) > 0 and (np.diff(positions) == 1).all():
+        if len(positions) == data.shape[1]:
+            return data
+        columns = slice(positions[0], positions[-1] + 1)
+
+    if isinstance(data, pd.DataFrame):
+        return data.iloc[:, columns]
+
+    if _is_sparse(data) and not isinstance(columns, slice):
+        return data.tocsc()[:, columns]
+
+    return data[:, columns]
@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+
+
+class Budget:
+    """
+    Limits on the work done by a wrapper selector.
+
+    When any limit is reached, `forward_selection`,
+    `recursive_feature_elimination` and `simulated_annealing` stop and
+    return their best result so far instead of running to completion.
+
+    Parameters
+    ----------
+    max_time : float or None (default=None)
+        Maximum wall-clock time in seconds. The scorer call in progress
+        is never interrupted, so a run can exceed it by one call
+
+    max_calls : int or None (default=None)
+        Maximum number of calls to the scorer. Scores answered by a
+        `ScoreCache` do not count, and a call to a batched scorer counts
+        once per subset it scores
+
+    patience : int or None (default=None)
+        Maximum number of consecutive rounds without improvement of the
+        best score: steps for `forward_selection`, iterations for
+        `simulated_annealing`. Ignored by
+        `recursive_feature_elimination`, whose scorer does not return
+        scores
+
+    Examples
+    --------
+    >>> from feature_selection import Budget, simulated_annealing
+    >>>
+    >>> budget = Budget(max_time=60, patience=50)
+    >>> simulated_annealing(scorer, X, y, iterations=10000, budget=budget)
+    array([0, 1, 3, 4])
+    """
+
+    def __init__(self, max_time=None, max_calls=None, patience=None):
+        for name, value in [('max_time', max_time),
+                            ('max_calls', max_calls),
+                            ('patience', patience)]:
+            if value is not None and value <= 0:
+                raise ValueError(f'{name} must be a positive number or '
+                                 'None.')
+
+        self.max_time = max_time
+        self.max_calls = max_calls
+        self.patience = patience
+
+    def __repr__(self):
+        return (f'Budget(max_time={self.max_time}, '
+                f'max_calls={self.max_calls}, patience={self.patience})')
+
+
+class _BudgetTracker:
+    """
+    Track the use of a `Budget` during one selector run (or one
+    simulated annealing chain).
+
+    `start` is the `time.monotonic()` at which the run began, so that
+    trackers created in worker processes share the same deadline.
+    """
+
+    def __init__(self, budget=None, start=None):
+        budget = budget or Budget()
+        start = time.monotonic() if start is None else start
+
+        self.deadline = np.inf if budget.max_time is None \
+            else start + budget.max_time
+        self.max_calls = budget.max_calls
+        self.patience = budget.patience
+        self.calls = 0
+        self.best = np.inf
+        self.stale = 0
+
+    def out_of_time(self):
+        return time.monotonic() >= self.deadline
+
+    def remaining_calls(self):
+        """
+        Number of scorer calls left, or None if unlimited.
+        """
+        if self.max_calls is None:
+            return None
+        return max(0, self.max_calls - self.calls)
+
+    def out_of_patience(self):
+        return self.patience is not None and self.stale >= self.patience
+
+    def exhausted(self):
+        """
+        Whether any limit has been reached.
+        """
+        return self.out_of_time() or self.remaining_calls() == 0 or \
+            self.out_of_patience()
+
+    def record_calls(self, n_calls=1):
+        self.calls += n_calls
+
+    def update(self, score):
+        """
+        Record the best score of a round and return whether it improved
+        on every earlier round.
+        """
+        if score < self.best:
+            self.best = score
+            self.stale = 0
+            return True
+
+        self.stale += 1
+        return False
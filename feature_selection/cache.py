@@ -0,0 +1,298 @@
+import hashlib
+import pickle
+import sqlite3
+import sys
+import uuid
+import weakref
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+from feature_selection._validation import _is_sparse
+
+_MISSING = object()
+
+# Rows hashed at a time when fingerprinting a dataset
+_FINGERPRINT_ROWS = 4096
+
+# Random tokens telling scorers apart in this process, by identity
+_SCORER_TOKENS = weakref.WeakKeyDictionary()
+_PINNED_TOKENS = {}
+_TOKENS_LOCK = Lock()
+
+
+class ScoreCache:
+    """
+    Bounded least-recently-used cache of scorer results keyed by dataset
+    and feature subset.
+
+    A subset is given as a boolean mask over the columns of X and is
+    stored under its packed bitmask (`np.packbits`), so a key costs one
+    bit per column and does not depend on the order in which the
+    columns were picked. Selectors prefix it with a fingerprint of X, y
+    and the scorer (see `fingerprint`), so one cache can be shared by
+    `forward_selection`, `recursive_feature_elimination` and
+    `simulated_annealing` runs on the same or different data. Scorers
+    are told apart by identity, so two closures made by the same factory
+    (e.g. two `cv_scorer` scorers) never share scores. Once `maxsize`
+    subsets or `max_bytes` bytes are stored, the least recently used
+    subsets are evicted.
+
+    With `path`, every score is also written to an SQLite database, and
+    subsets missing from memory are looked up there, so later runs, for
+    example the next nightly job, skip fits that were already done. The
+    database is never evicted from. Scorer objects do not survive
+    between runs, so persisted scores are keyed by `scorer_key` and the
+    qualified name of the scorer instead: give a new `scorer_key`
+    whenever what the scorer computes changes.
+
+    The cache is safe to share between threads. Process pools work on
+    pickled copies, so hits and new scores in worker processes are not
+    reported back, except through the database.
+
+    Parameters
+    ----------
+    maxsize : int or None (default=1024)
+        Maximum number of subsets kept in memory. None means unbounded
+
+    max_bytes : int or None (default=None)
+        Maximum approximate size in bytes of the keys and scores kept in
+        memory. None means unbounded
+
+    path : str or None (default=None)
+        SQLite database file used to persist scores between runs
+
+    scorer_key : str or None (default=None)
+        Name identifying the scorer and its settings, e.g. 'ridge-5fold-v2',
+        required with `path`
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups answered from the cache
+
+    misses : int
+        Number of lookups that required a call to the scorer
+
+    nbytes : int
+        Approximate size in bytes of the keys and scores kept in memory
+
+    Examples
+    --------
+    >>> from feature_selection import ScoreCache, simulated_annealing
+    >>>
+    >>> cache = ScoreCache(maxsize=10000, path='scores.sqlite',
+    >>>                    scorer_key='ridge-v1')
+    >>> simulated_annealing(scorer, X, y, iterations=1000, cache=cache)
+    >>> cache.hits, cache.misses
+    (412, 589)
+    """
+
+    def __init__(self, maxsize=1024, max_bytes=None, path=None,
+                 scorer_key=None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be a positive number or None.')
+
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError('max_bytes must be a positive number or None.')
+
+        if path is not None and scorer_key is None:
+            raise ValueError('A persistent cache needs a scorer_key '
+                             'identifying the scorer between runs.')
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.path = path
+        self.scorer_key = scorer_key
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._connect()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_db']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+        self._connect()
+
+    def _connect(self):
+        self._db = None
+
+        if self.path is not None:
+            self._db = sqlite3.connect(self.path, isolation_level=None,
+                                       check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS scores '
+                             '(key BLOB PRIMARY KEY, score BLOB)')
+
+    @staticmethod
+    def fingerprint(X, y, scorer=None, scorer_key=None):
+        """
+        Return a digest identifying the dataset `X`, `y` and `scorer`.
+
+        The digest covers the shape, dtype and values of X and y. The
+        scorer is identified by `scorer_key` and its qualified name if
+        `scorer_key` is given, so that the digest is stable between
+        runs, and otherwise by the scorer object itself, so that the
+        digest is only valid in this process.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+
+        if scorer_key is not None:
+            name = getattr(scorer, '__qualname__', type(scorer).__qualname__)
+            digest.update(f'key:{scorer_key}:{scorer.__module__}.{name}'
+                          .encode())
+        elif scorer is not None:
+            digest.update(b'token:' + _scorer_token(scorer))
+
+        for data in (X, y):
+            # Sparse matrices are hashed by their canonical CSC arrays,
+            # without densifying them
+            if _is_sparse(data):
+                data = data.tocsc(copy=True)
+                data.sum_duplicates()
+                digest.update(f'sparse{data.shape}{data.dtype.str}'.encode())
+                for part in (data.indptr, data.indices, data.data):
+                    digest.update(np.ascontiguousarray(part).data)
+                continue
+
+            if isinstance(data, (pd.DataFrame, pd.Series)):
+                digest.update(repr(list(getattr(data, 'columns', [])))
+                              .encode())
+                data = pd.util.hash_pandas_object(data, index=False).values
+
+            data = np.asarray(data)
+            digest.update(f'{data.shape}{data.dtype.str}'.encode())
+
+            for start in range(0, data.shape[0], _FINGERPRINT_ROWS):
+                digest.update(np.ascontiguousarray(
+                    data[start:start + _FINGERPRINT_ROWS]).data)
+
+        return digest.digest()
+
+    @staticmethod
+    def key(mask, fingerprint=b''):
+        """
+        Return the key used to store the subset `mask` of the dataset
+        identified by `fingerprint`.
+        """
+        return fingerprint + np.packbits(np.asarray(mask, dtype=bool)) \
+            .tobytes()
+
+    def get(self, mask, default=None, fingerprint=b''):
+        """
+        Return the cached score of the subset `mask`, or `default` if it
+        is not cached, and count the hit or miss.
+        """
+        key = self.key(mask, fingerprint)
+
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT score FROM scores WHERE key = ?',
+                    (key,)).fetchone()
+
+                if row is not None:
+                    self.hits += 1
+                    score = pickle.loads(row[0])
+                    self._store(key, score)
+                    return score
+
+            self.misses += 1
+            return default
+
+    def put(self, mask, score, fingerprint=b''):
+        """
+        Store the score of the subset `mask`, evicting the least recently
+        used subsets if the cache is full.
+        """
+        key = self.key(mask, fingerprint)
+
+        with self._lock:
+            self._store(key, score)
+
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO scores VALUES (?, ?)',
+                    (key, pickle.dumps(score)))
+
+    def _count(self, hits, misses):
+        """
+        Add hits and misses counted by a copy of the cache, e.g. in a
+        worker process.
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _store(self, key, score):
+        if key in self._entries:
+            self.nbytes -= _sizeof(key, self._entries.pop(key))
+
+        self._entries[key] = score
+        self.nbytes += _sizeof(key, score)
+
+        while self._entries and (
+                (self.maxsize is not None and
+                 len(self._entries) > self.maxsize) or
+                (self.max_bytes is not None and
+                 self.nbytes > self.max_bytes)):
+            self.nbytes -= _sizeof(*self._entries.popitem(last=False))
+
+    def score(self, scorer, X, y, mask, fingerprint=b''):
+        """
+        Return `scorer(X[:, mask], y)`, calling the scorer only if the
+        subset `mask` is not cached yet.
+        """
+        score = self.get(mask, _MISSING, fingerprint)
+
+        if score is _MISSING:
+            score = scorer(X[:, mask], y)
+            self.put(mask, score, fingerprint)
+
+        return score
+
+    def clear(self):
+        """
+        Remove every score kept in memory and reset the hit and miss
+        counters. Scores persisted to `path` are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.nbytes = 0
+
+
+def _scorer_token(scorer):
+    """
+    Return a random token that identifies the object `scorer` for as
+    long as it exists. Objects that cannot be weakly referenced are kept
+    alive, so their token is never given to another object.
+    """
+    with _TOKENS_LOCK:
+        try:
+            return _SCORER_TOKENS.setdefault(scorer, uuid.uuid4().bytes)
+        except TypeError:
+            return _PINNED_TOKENS.setdefault(
+                id(scorer), (scorer, uuid.uuid4().bytes))[1]
+
+
+def _sizeof(key, score):
+    return len(key) + sys.getsizeof(score)
@@ -0,0 +1,141 @@
+import numpy as np
+
+from feature_selection._parallel import _executor_scope
+from feature_selection._validation import _column_block, _is_array_like, \
+    _is_sparse, _open_npy
+
+
+def correlation_thresholding(data, threshold=0.9, block_size=1024,
+                             dtype=np.float64, n_jobs=None):
+    """
+    Select features that are not nearly duplicates of earlier features
+
+    Features are visited from left to right and a feature is dropped
+    when the absolute value of its Pearson correlation with a feature
+    kept before it is above the threshold, so of a group of correlated
+    features the leftmost one is kept. The result does not depend on
+    `block_size`, `dtype` (up to rounding) or `n_jobs`.
+
+    The correlations are computed as products of blocks of
+    standardized columns, so memory stays proportional to
+    `n_samples * block_size + block_size ** 2` rather than to the square
+    of the number of features, and each block is only compared with the
+    columns kept from the blocks before it.
+
+    Parameters
+    ----------
+    data : numpy ndarray, pandas DataFrame, list, sparse matrix or path
+      Numerical features without missing values. Memory maps and paths
+      to `.npy` files (opened as read-only memory maps) are read one
+      block of columns at a time, and `scipy.sparse` matrices are only
+      densified one block at a time
+    threshold : float, optional
+      Maximum absolute correlation, between 0 and 1, of a kept feature
+      with the features kept before it
+    block_size : int, optional
+      Number of columns standardized and multiplied at a time
+    dtype : numpy dtype, optional
+      Precision of the computation. `np.float32` halves the memory and
+      roughly doubles the speed of the products, with correlations
+      accurate to about 1e-6
+    n_jobs : int, optional
+      Number of threads multiplying a block with the earlier blocks
+      concurrently. NumPy releases the GIL in its products, so this
+      helps when the BLAS library is single-threaded. None runs serially
+      and -1 uses all CPUs
+
+    Returns
+    -------
+    numpy ndarray
+      A 1d array of indexes of the features that are kept, in
+      increasing order. Constant features have no correlation with any
+      other feature and are always kept
+
+    Examples
+    --------
+    >>> from feature_selection import correlation_thresholding
+    >>> X = [[1, 2, 0, 5], [2, 4, 4, 3], [3, 6, 1, 1], [4, 8, 7, 0]]
+    >>> correlation_thresholding(X, threshold=0.95)
+    array([0, 2])
+    """
+    data = _open_npy(data)
+
+    if isinstance(data, list):
+        data = np.asarray(data)
+
+    if not _is_array_like(data):
+        raise TypeError('Data is of an invalid type.')
+
+    if len(data.shape) != 2:
+        raise ValueError('Data must be a 2-d array.')
+
+    if not 0 <= threshold <= 1:
+        raise ValueError('threshold must be between 0 and 1.')
+
+    if block_size < 1:
+        raise ValueError('block_size must be a positive number.')
+
+    # Columns are sliced from the CSC format
+    if _is_sparse(data):
+        data = data.tocsc()
+
+    n_features = data.shape[1]
+    kept = []
+
+    with _executor_scope(n_jobs, 'thread') as pool:
+        for start in range(0, n_features, block_size):
+            stop = min(start + block_size, n_features)
+            block = _standardized(data, slice(start, stop), dtype)
+
+            # Drop the columns correlated with columns kept from earlier
+            # blocks, one earlier block per product
+            earlier = [columns for columns in kept if len(columns) > 0]
+            if pool is None:
+                correlated = [_correlated(data, columns, block, threshold,
+                                          dtype) for columns in earlier]
+            else:
+                futures = [pool.submit(_correlated, data, columns, block,
+                                       threshold, dtype)
+                           for columns in earlier]
+                correlated = [future.result() for future in futures]
+
+            dropped = np.zeros(stop - start, dtype=bool)
+            for mask in correlated:
+                dropped |= mask
+
+            # Then keep the block's columns greedily from left to right
+            within = np.abs(block.T @ block) > threshold
+            for j in range(stop - start):
+                if not dropped[j]:
+                    dropped[j + 1:] |= within[j, j + 1:]
+
+            kept.append(start + np.flatnonzero(~dropped))
+
+    return np.concatenate(kept) if kept else np.array([], dtype=int)
+
+
+def _standardized(data, columns, dtype):
+    """
+    Return the `columns` of `data` centered and scaled to unit norm, so
+    that their products are correlations. Constant columns are zero.
+    """
+    block = _column_block(data, columns, dtype)
+    constant = block.min(axis=0) == block.max(axis=0)
+    block = block - block.mean(axis=0)
+
+    # Constant columns may not center to exactly 0, so test them directly
+    norms = np.sqrt(np.einsum('ij,ij->j', block, block))
+    nonzero = (norms > 0) & ~constant
+    block[:, nonzero] /= norms[nonzero]
+    block[:, ~nonzero] = 0
+
+    return block
+
+
+def _correlated(data, columns, block, threshold, dtype):
+    """
+    Return which columns of the standardized `block` are correlated
+    above `threshold` with one of the `columns` of `data`.
+    """
+    earlier = _standardized(data, columns, dtype)
+    return (np.abs(earlier.T @ block) > threshold).any(axis=0)
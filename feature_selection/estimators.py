@@ -0,0 +1,348 @@
+"""
+scikit-learn estimators wrapping the selectors of this package, so they
+can be used in a `Pipeline`, `GridSearchCV` or `cross_validate`.
+
+This module needs scikit-learn, which the rest of the package does not,
+so it is not imported by `feature_selection` itself::
+
+    from feature_selection.estimators import ForwardSelector
+"""
+from abc import abstractmethod
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.feature_selection import SelectorMixin
+from sklearn.utils.validation import check_array, check_is_fitted
+
+from feature_selection.cache import ScoreCache, _scorer_token
+from feature_selection.forward_selection import forward_selection
+from feature_selection.recursive_feature_elimination import \
+    recursive_feature_elimination
+from feature_selection.simulated_annealing import simulated_annealing
+from feature_selection.variance_thresholding import variance_thresholding
+from feature_selection._validation import _is_array_like, _open_npy, \
+    _take_columns
+
+# Parameters that do not change the selected features
+_VOLATILE = ('n_jobs', 'executor', 'cache', 'callback')
+
+
+class _Selector(SelectorMixin, BaseEstimator):
+    """
+    Base class of the estimators: runs `_select` in `fit`, unless the
+    same selection was already fitted, and slices columns in
+    `transform`.
+
+    Selections are kept in a cache shared by every instance, keyed by the
+    estimator's class, the fingerprint of X and y (see
+    `ScoreCache.fingerprint`) and the parameters that affect the result,
+    scorers being told apart by identity as in `ScoreCache`, so two
+    closures made by the same factory never share a selection.
+    scikit-learn clones estimators before every fit, so this is what
+    lets a grid search over the parameters of later steps of a
+    `Pipeline` reuse the selection fitted on each fold instead of
+    running it again.
+
+    Attributes
+    ----------
+    selected_ : numpy ndarray
+        Indexes of the selected features, in the order the selector
+        returned them
+
+    support_ : numpy ndarray
+        Boolean mask of the selected features
+
+    n_features_in_ : int
+        Number of features of X
+
+    feature_names_in_ : numpy ndarray
+        Column names of X, only if X is a DataFrame
+
+    reused_ : bool
+        Whether the last `fit` reused a cached selection
+    """
+
+    # Selections kept, shared by every estimator
+    max_fitted = 128
+
+    _fitted = OrderedDict()
+    _lock = Lock()
+
+    def fit(self, X, y=None):
+        """
+        Select features of X, or reuse the selection already fitted with
+        the same parameters on the same data.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            A NumPy array, memory map, Pandas DataFrame, `scipy.sparse`
+            matrix or path to a `.npy` file
+
+        y : array-like of shape (n_samples,)
+            Target values
+
+        Returns
+        -------
+        self
+        """
+        X = _check_X(X)
+
+        # Lists, Series and other array-likes are given as arrays
+        if y is not None:
+            y = _open_npy(y)
+            if not _is_array_like(y):
+                y = np.asarray(y)
+
+        key = None
+        if self._reusable():
+            key = (type(self).__qualname__,
+                   ScoreCache.fingerprint(X, [] if y is None else y),
+                   self._params_key())
+
+        with _Selector._lock:
+            selected = _Selector._fitted.get(key)
+            if selected is not None:
+                _Selector._fitted.move_to_end(key)
+
+        self.reused_ = selected is not None
+        if selected is None:
+            selected = np.asarray(self._select(X, y), dtype=np.intp)
+
+            if key is not None:
+                with _Selector._lock:
+                    _Selector._fitted[key] = selected
+                    while len(_Selector._fitted) > self.max_fitted:
+                        _Selector._fitted.popitem(last=False)
+
+        self.n_features_in_ = X.shape[1]
+        if isinstance(X, pd.DataFrame):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        elif hasattr(self, 'feature_names_in_'):
+            del self.feature_names_in_
+
+        self.selected_ = selected
+        self.support_ = np.zeros(X.shape[1], dtype=bool)
+        self.support_[selected] = True
+
+        return self
+
+    def transform(self, X):
+        """
+        Return the selected columns of X, in increasing order.
+
+        X is not copied: the result is X itself if every feature is
+        selected and a view of X if the selected features are
+        contiguous. Otherwise only the selected columns are copied.
+        """
+        check_is_fitted(self)
+        X = _check_X(X)
+
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f'X has {X.shape[1]} features, but '
+                             f'{type(self).__name__} is expecting '
+                             f'{self.n_features_in_} features as input.')
+
+        return _take_columns(X, np.flatnonzero(self.support_))
+
+    @classmethod
+    def clear_fitted(cls):
+        """
+        Forget every cached selection.
+        """
+        with _Selector._lock:
+            _Selector._fitted.clear()
+
+    def _get_support_mask(self):
+        check_is_fitted(self)
+        return self.support_
+
+    def _reusable(self):
+        """
+        Whether the selection only depends on the data and the
+        parameters, and can be cached.
+        """
+        return getattr(self, 'budget', None) is None
+
+    def _params_key(self):
+        """
+        Return a string identifying the parameters affecting the result.
+        """
+        params = []
+        for name, value in sorted(self.get_params(deep=False).items()):
+            if name in _VOLATILE:
+                continue
+            if callable(value):
+                value = _scorer_token(value).hex()
+            params.append(f'{name}={value!r}')
+
+        return ','.join(params)
+
+    @abstractmethod
+    def _select(self, X, y):
+        """
+        Return the indexes of the features of X to select.
+        """
+
+    def __sklearn_tags__(self):
+        tags = super().__sklearn_tags__()
+        tags.input_tags.sparse = True
+        return tags
+
+    def _more_tags(self):
+        # Tags of scikit-learn before 1.6
+        return {'X_types': ['2darray', 'sparse']}
+
+
+class ForwardSelector(_Selector):
+    """
+    Forward selection as a scikit-learn estimator, see
+    `feature_selection.forward_selection` for the parameters.
+
+    Examples
+    --------
+    >>> from sklearn.linear_model import LinearRegression
+    >>> from sklearn.pipeline import make_pipeline
+    >>> from feature_selection.estimators import ForwardSelector
+    >>>
+    >>> model = make_pipeline(ForwardSelector(scorer, max_features=6),
+    >>>                       LinearRegression())
+    >>> model.fit(X, y).predict(X)
+    """
+
+    def __init__(self, scorer, min_features=1, max_features=10, n_jobs=None,
+                 executor=None, cache=None, budget=None, callback=None,
+                 floating=False):
+        self.scorer = scorer
+        self.min_features = min_features
+        self.max_features = max_features
+        self.n_jobs = n_jobs
+        self.executor = executor
+        self.cache = cache
+        self.budget = budget
+        self.callback = callback
+        self.floating = floating
+
+    def _select(self, X, y):
+        return forward_selection(
+            self.scorer, X, y, self.min_features, self.max_features,
+            n_jobs=self.n_jobs, executor=self.executor, cache=self.cache,
+            budget=self.budget, callback=self.callback,
+            floating=self.floating)
+
+
+class RecursiveEliminator(_Selector):
+    """
+    Recursive feature elimination as a scikit-learn estimator, see
+    `feature_selection.recursive_feature_elimination` for the
+    parameters.
+    """
+
+    def __init__(self, scorer, n_features_to_select=None, step=1, cache=None,
+                 budget=None, callback=None):
+        self.scorer = scorer
+        self.n_features_to_select = n_features_to_select
+        self.step = step
+        self.cache = cache
+        self.budget = budget
+        self.callback = callback
+
+    def _select(self, X, y):
+        selected = recursive_feature_elimination(
+            self.scorer, X, y, self.n_features_to_select,
+            cache=self.cache, step=self.step, budget=self.budget,
+            callback=self.callback)
+
+        # Features of a DataFrame are returned by name
+        if isinstance(X, pd.DataFrame):
+            return X.columns.get_indexer(selected)
+
+        return selected
+
+
+class AnnealingSelector(_Selector):
+    """
+    Simulated annealing as a scikit-learn estimator, see
+    `feature_selection.simulated_annealing` for the parameters.
+
+    Selections are only cached when `random_state` is an int, since
+    they are random otherwise.
+    """
+
+    def __init__(self, scorer, c=1, iterations=100, random_state=None,
+                 n_chains=1, n_jobs=None, executor=None, cache=None,
+                 budget=None, callback=None, batch_size=1, temperatures=None,
+                 swap_interval=10):
+        self.scorer = scorer
+        self.c = c
+        self.iterations = iterations
+        self.random_state = random_state
+        self.n_chains = n_chains
+        self.n_jobs = n_jobs
+        self.executor = executor
+        self.cache = cache
+        self.budget = budget
+        self.callback = callback
+        self.batch_size = batch_size
+        self.temperatures = temperatures
+        self.swap_interval = swap_interval
+
+    def _reusable(self):
+        return super()._reusable() and \
+            isinstance(self.random_state, (int, np.integer))
+
+    def _select(self, X, y):
+        return simulated_annealing(
+            self.scorer, X, y, self.c, self.iterations,
+            random_state=self.random_state, n_chains=self.n_chains,
+            n_jobs=self.n_jobs, executor=self.executor, cache=self.cache,
+            budget=self.budget, callback=self.callback,
+            batch_size=self.batch_size, temperatures=self.temperatures,
+            swap_interval=self.swap_interval)
+
+
+class VarianceSelector(_Selector):
+    """
+    Variance thresholding as a scikit-learn estimator, see
+    `feature_selection.variance_thresholding` for the parameters. y is
+    ignored.
+    """
+
+    def __init__(self, threshold=0):
+        self.threshold = threshold
+
+    def _select(self, X, y):
+        return variance_thresholding(X, self.threshold)
+
+    def __sklearn_tags__(self):
+        tags = super().__sklearn_tags__()
+        tags.target_tags.required = False
+        return tags
+
+    def _more_tags(self):
+        return {'requires_y': False}
+
+
+def _check_X(X):
+    """
+    Validate X like scikit-learn estimators do: a 2d array of finite
+    numbers with at least one sample and one feature, possibly sparse.
+
+    X itself is returned unless it had to be converted, e.g. from a list
+    or an object array, so DataFrames keep their column labels and
+    memory maps are not read into memory.
+    """
+    X = _open_npy(X)
+    checked = check_array(X, accept_sparse=True)
+
+    if isinstance(X, pd.DataFrame) or checked is X:
+        return X
+
+    if isinstance(X, np.ndarray) and checked.dtype == X.dtype and \
+            np.may_share_memory(checked, X):
+        return X
+
+    return checked
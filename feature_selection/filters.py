@@ -0,0 +1,280 @@
+import numpy as np
+
+from feature_selection._validation import _column_block, _is_array_like, \
+    _is_sparse, _open_npy
+
+# Approximate number of values per block of columns scored at a time
+_BLOCK_SIZE = 2 ** 20
+
+_METHODS = ('pearson', 'f_regression', 'f_classif', 'chi2', 'mutual_info')
+
+
+def univariate_scores(X, y, method='f_regression', n_bins=10):
+    """
+    Score the relevance of every feature to the target on its own.
+
+    All the columns are scored in one vectorized pass, a block of
+    columns at a time, so memory maps, paths to `.npy` files and sparse
+    matrices are never copied or densified as a whole.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Numerical features: a NumPy array, a Pandas DataFrame, a
+        `scipy.sparse` matrix or a path to a `.npy` file, which is opened
+        as a read-only memory map
+
+    y : array-like of shape (n_samples,)
+        Target values, or class labels for 'f_classif', 'chi2' and
+        'mutual_info' with a non-float target
+
+    method : str (default='f_regression')
+        'pearson' for the absolute Pearson correlation with y,
+        'f_regression' for the F-statistic of a linear regression on each
+        feature, 'f_classif' for the ANOVA F-statistic between classes,
+        'chi2' for the chi-squared statistic of non-negative features
+        (e.g. counts) against classes, or 'mutual_info' for the mutual
+        information, in nats, between the binned feature and the target
+
+    n_bins : int (default=10)
+        Number of equal-width bins of the features, and of a float
+        target, for 'mutual_info'
+
+    Returns
+    -------
+    numpy ndarray
+        One score per feature, higher meaning more relevant. Constant
+        features score 0.
+
+    Examples
+    --------
+    >>> from sklearn.datasets import make_friedman1
+    >>> from feature_selection.filters import univariate_scores
+    >>>
+    >>> X, y = make_friedman1(n_samples=200, n_features=6, random_state=0)
+    >>> univariate_scores(X, y, 'pearson').round(2)
+    array([0.31, 0.47, 0.04, 0.6 , 0.25, 0.09])
+    """
+    X, y = _validate(X, y, method, n_bins)
+    target = _Target(y, method, n_bins)
+    scores = np.empty(X.shape[1])
+
+    for start, block in _column_blocks(X):
+        scores[start:start + block.shape[1]] = target.score(block)
+
+    return scores
+
+
+def select_k_best(X, y, k=10, method='f_regression', n_bins=10):
+    """
+    Select the `k` features most relevant to the target on their own.
+
+    A cheap filter to prune many features before a wrapper selector such
+    as `forward_selection`. Features are ranked by `univariate_scores`,
+    ties going to the leftmost feature.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Numerical features: a NumPy array, a Pandas DataFrame, a
+        `scipy.sparse` matrix or a path to a `.npy` file
+
+    y : array-like of shape (n_samples,)
+        Target values or class labels
+
+    k : int (default=10)
+        Number of features to select. All of them are selected if there
+        are fewer
+
+    method : str (default='f_regression')
+        Relevance score, see `univariate_scores`
+
+    n_bins : int (default=10)
+        Number of bins for 'mutual_info'
+
+    Returns
+    -------
+    numpy ndarray
+        A 1d array of the indexes of the selected features, in
+        increasing order
+
+    Examples
+    --------
+    >>> from sklearn.datasets import make_friedman1
+    >>> from feature_selection import forward_selection, select_k_best
+    >>>
+    >>> X, y = make_friedman1(n_samples=200, n_features=1000,
+    >>>                       random_state=0)
+    >>> kept = select_k_best(X, y, k=50)
+    >>> kept[forward_selection(scorer, X[:, kept], y, 3, 6)]
+    array([0, 1, 3, 4])
+    """
+    if k < 1:
+        raise ValueError('k must be a positive number.')
+
+    scores = univariate_scores(X, y, method, n_bins)
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+
+    # Highest scores first, the leftmost feature on ties
+    order = np.lexsort((np.arange(len(scores)), -scores))
+
+    return np.sort(order[:k])
+
+
+def _validate(X, y, method, n_bins):
+    """
+    Check the inputs and return X and y ready to be scored.
+    """
+    if method not in _METHODS:
+        raise ValueError(f'method must be one of {", ".join(_METHODS)}.')
+
+    if n_bins < 2:
+        raise ValueError('n_bins must be at least 2.')
+
+    X = _open_npy(X)
+    y = _open_npy(y)
+
+    if not _is_array_like(X):
+        raise TypeError('X must be a NumPy array, a Pandas DataFrame or a '
+                        'sparse matrix.')
+
+    if len(X.shape) != 2:
+        raise ValueError('X must be a 2-d array.')
+
+    y = np.asarray(y)
+    if y.ndim != 1:
+        raise ValueError('y must be a 1-d array.')
+
+    if X.shape[0] != y.shape[0]:
+        raise ValueError(f'X and y have inconsistent numbers of samples: '
+                         f'[{X.shape[0]}, {y.shape[0]}]')
+
+    # Columns are sliced from the CSC format
+    if _is_sparse(X):
+        X = X.tocsc()
+
+    return X, y
+
+
+def _column_blocks(X):
+    """
+    Yield the start and the float values of every block of about
+    `_BLOCK_SIZE` values of columns of X.
+    """
+    step = max(1, _BLOCK_SIZE // max(1, X.shape[0]))
+
+    for start in range(0, X.shape[1], step):
+        yield start, _column_block(X, slice(start, start + step))
+
+
+class _Target:
+    """
+    The target prepared once for a scoring method, scoring one block of
+    columns at a time.
+    """
+
+    def __init__(self, y, method, n_bins):
+        self.method = method
+        self.n_bins = n_bins
+        self.n_samples = len(y)
+
+        if method in ('pearson', 'f_regression'):
+            self.y = y.astype(float) - y.mean()
+            self.y_norm = np.sqrt(self.y @ self.y)
+            return
+
+        # Binned float targets for mutual information, classes otherwise
+        if method == 'mutual_info' and np.issubdtype(y.dtype, np.floating):
+            self.labels = _bin(y[:, np.newaxis], n_bins)[:, 0]
+            self.n_classes = n_bins
+        else:
+            _, self.labels = np.unique(y, return_inverse=True)
+            self.n_classes = self.labels.max() + 1
+
+        self.onehot = np.zeros((self.n_samples, self.n_classes))
+        self.onehot[np.arange(self.n_samples), self.labels] = 1
+        self.class_counts = self.onehot.sum(axis=0)
+
+    def score(self, X):
+        return getattr(self, f'_{self.method}')(X)
+
+    def _pearson(self, X):
+        X = X - X.mean(axis=0)
+        norms = np.sqrt(np.einsum('ij,ij->j', X, X)) * self.y_norm
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = np.where(norms > 0, (X.T @ self.y) / norms, 0)
+
+        return np.abs(np.clip(r, -1, 1))
+
+    def _f_regression(self, X):
+        r2 = self._pearson(X) ** 2
+
+        with np.errstate(divide='ignore'):
+            return np.where(r2 < 1, r2 / (1 - r2) * (self.n_samples - 2),
+                            np.inf)
+
+    def _f_classif(self, X):
+        # Sums of squares between and within the classes
+        means = (self.onehot.T @ X) / self.class_counts[:, np.newaxis]
+        overall = X.mean(axis=0)
+        between = self.class_counts @ (means - overall) ** 2
+        within = np.einsum('ij,ij->j', X, X) - \
+            self.class_counts @ means ** 2
+
+        df_between = self.n_classes - 1
+        df_within = self.n_samples - self.n_classes
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            f = (between / df_between) / (np.maximum(within, 0) / df_within)
+
+        return np.where(between > 0, f, 0)
+
+    def _chi2(self, X):
+        if (X < 0).any():
+            raise ValueError("method='chi2' requires non-negative "
+                             "features.")
+
+        observed = self.onehot.T @ X
+        expected = np.outer(self.class_counts / self.n_samples,
+                            X.sum(axis=0))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            terms = np.where(expected > 0,
+                             (observed - expected) ** 2 / expected, 0)
+
+        return terms.sum(axis=0)
+
+    def _mutual_info(self, X):
+        n_features = X.shape[1]
+        bins = _bin(X, self.n_bins)
+
+        # Joint counts of (feature, bin, class) in a single bincount
+        cells = self.n_bins * self.n_classes
+        index = np.arange(n_features) * cells + bins * self.n_classes + \
+            self.labels[:, np.newaxis]
+        joint = np.bincount(index.ravel(), minlength=n_features * cells)
+        joint = joint.reshape(n_features, self.n_bins, self.n_classes) / \
+            self.n_samples
+
+        p_bin = joint.sum(axis=2, keepdims=True)
+        p_class = self.class_counts / self.n_samples
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            terms = joint * np.log(joint / (p_bin * p_class))
+
+        return np.nansum(terms, axis=(1, 2))
+
+
+def _bin(X, n_bins):
+    """
+    Assign every value of each column of X to one of `n_bins` bins of
+    equal width between the column's minimum and maximum.
+    """
+    low = X.min(axis=0)
+    width = X.max(axis=0) - low
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bins = np.where(width > 0, (X - low) / width * n_bins, 0)
+
+    return np.minimum(bins.astype(np.intp), n_bins - 1)
@@ -1,10 +1,361 @@
+import os
+import time
+from functools import partial
 from inspect import isfunction
 
 import numpy as np
 import pandas as pd
 
+from feature_selection._parallel import _Resident, _effective_n_jobs, \
+    _executor_scope, _split
+from feature_selection._checkpoint import _load_checkpoint, \
+    _save_checkpoint
+from feature_selection._validation import _is_array_like, _is_sparse, \
+    _open_npy
+from feature_selection.budget import _BudgetTracker
+from feature_selection.cache import ScoreCache
+from feature_selection.profiling import _Profiler
+from feature_selection.scoring import _is_batched, _is_incremental, \
+    _score_batch
 
-def forward_selection(scorer, X, y, min_features=1, max_features=10):
+
+class _IncrementalLeastSquares:
+    '''
+    Built-in scorer for `scorer='linear'`.
+
+    Scores every candidate column at once as `1 - R^2` of an ordinary
+    least squares fit with an intercept on the selected columns plus
+    the candidate. The selected columns are kept as an orthonormal
+    basis (the Q of a QR factorization) and the candidates and target
+    are stored as residuals against it, so adding a column is a
+    rank-one update and scoring all candidates is a single vectorized
+    operation instead of one fit per candidate.
+    '''
+
+    def __init__(self, X, y):
+        # Centering is the projection onto the intercept column
+        self.X_res = np.array(X, dtype=float)
+        self.X_res -= self.X_res.mean(axis=0)
+        self.y_res = np.array(y, dtype=float)
+        self.y_res -= self.y_res.mean()
+
+        self.tss = self.y_res @ self.y_res
+        self.rss = self.tss
+        self.tol = np.finfo(float).eps * X.shape[0] * \
+            np.einsum('ij,ij->j', self.X_res, self.X_res)
+        self._update()
+
+    def _update(self):
+        self.norms = np.einsum('ij,ij->j', self.X_res, self.X_res)
+        self.proj = self.X_res.T @ self.y_res
+
+    def score(self, candidates):
+        '''
+        Return `1 - R^2` for each candidate added to the selection.
+        '''
+        norms = self.norms[candidates]
+        proj = self.proj[candidates]
+
+        # Candidates that are collinear with the selection add nothing
+        gain = np.zeros(len(candidates))
+        independent = norms > self.tol[candidates]
+        gain[independent] = proj[independent] ** 2 / norms[independent]
+
+        if self.tss == 0:
+            return np.zeros(len(candidates))
+
+        return np.maximum(self.rss - gain, 0) / self.tss
+
+    def add(self, i):
+        '''
+        Add column `i` to the basis of selected columns.
+        '''
+        if self.norms[i] <= self.tol[i]:
+            return
+
+        q = self.X_res[:, i] / np.sqrt(self.norms[i])
+
+        self.X_res -= np.outer(q, q @ self.X_res)
+        self.y_res -= q * (q @ self.y_res)
+        self.rss = self.y_res @ self.y_res
+        self._update()
+
+
+class _Scoring(_Resident):
+    '''
+    Everything needed to score candidates during one run, bundled so it
+    can be sent to worker threads or processes in a single argument.
+    Process pools created by `forward_selection` receive it once per
+    worker, see `_Resident`.
+    '''
+
+    def __init__(self, scorer, X, y, cache=None, fingerprint=b'',
+                 deadline=np.inf, timed=False):
+        self.scorer = scorer
+        self.X = X
+        self.y = y
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.deadline = deadline
+        self.timed = timed
+
+
+def _score_chunk(scoring, selected, candidates, buffer=None, max_calls=None):
+    '''
+    Score each candidate column added to the selected columns.
+
+    `buffer` is an (n_samples, n_selected + 1) workspace whose leading
+    columns already hold the selected columns; only its last column is
+    overwritten with each candidate before it is passed to the scorer. A
+    new workspace is filled from `selected` when `buffer` is None.
+
+    For a sparse X, the workspace is a 1d array of the column indices
+    of the selection plus the candidate instead, and the scorer is given
+    those columns of the CSC matrix.
+
+    Returns the scores of the leading candidates scored before the
+    deadline and within `max_calls`, and the duration of each scorer
+    call if `scoring.timed`.
+    '''
+    X = scoring.X
+
+    if buffer is None:
+        buffer = np.empty(selected.shape[:-1] + (selected.shape[-1] + 1,),
+                          dtype=selected.dtype, order='F')
+        buffer[..., :-1] = selected
+
+    fn_score = []
+    durations = []
+
+    for i in candidates:
+        if time.monotonic() >= scoring.deadline or \
+                len(fn_score) == max_calls:
+            break
+
+        if buffer.ndim == 1:
+            buffer[-1] = i
+        else:
+            buffer[:, -1] = X[:, i]
+
+        fn_score.append(_call(scoring, buffer, durations))
+
+    return fn_score, durations
+
+
+def _score_candidates(scoring, workspace, n_selected, candidates, pool,
+                      n_chunks, subset, max_calls=None):
+    '''
+    Score every candidate column added to the boolean mask `subset` of
+    selected columns, serially or on `pool`.
+
+    The scores are always returned in the order of `candidates` so the
+    parallel path breaks ties exactly like the serial one. The serial
+    path reuses `workspace` in place, while each parallel chunk gets a
+    private copy of the selected columns.
+
+    Returns the scores, the number of scorer calls made, whether every
+    candidate was scored within the deadline and `max_calls`, and the
+    durations of the scorer calls.
+    '''
+    if pool is None:
+        score_chunk = partial(_score_chunk, scoring, None,
+                              buffer=workspace[..., :n_selected + 1])
+    else:
+        score_chunk = partial(_score_chunk, scoring,
+                              workspace[..., :n_selected])
+
+    return _score_memoized(scoring, subset, candidates, candidates,
+                           score_chunk, pool, n_chunks, max_calls)
+
+
+def _score_removals_chunk(scoring, selected, positions, max_calls=None):
+    '''
+    Score the selection without each of the columns at `positions`, in
+    increasing order, of the selected columns.
+
+    `selected` holds the selected columns like the workspace of
+    `_score_chunk`, or their indices for a sparse X. Each subset is
+    built in a buffer of all the selected columns but one, in which only
+    the columns between two consecutive positions change from one subset
+    to the next.
+
+    Returns the same as `_score_chunk`.
+    '''
+    fn_score = []
+    durations = []
+    if len(positions) == 0:
+        return fn_score, durations
+
+    p = positions[0]
+    buffer = np.empty(selected.shape[:-1] + (selected.shape[-1] - 1,),
+                      dtype=selected.dtype, order='F')
+    buffer[..., :p] = selected[..., :p]
+    buffer[..., p:] = selected[..., p + 1:]
+
+    for q in positions:
+        if time.monotonic() >= scoring.deadline or \
+                len(fn_score) == max_calls:
+            break
+
+        # Put back the columns between the last position and this one
+        buffer[..., p:q] = selected[..., p:q]
+        p = q
+
+        fn_score.append(_call(scoring, buffer, durations))
+
+    return fn_score, durations
+
+
+def _score_removals(scoring, workspace, features, positions, pool, n_chunks,
+                    subset, max_calls=None):
+    '''
+    Score the selection without each of the columns at `positions` of
+    the selection, serially or on `pool`, like `_score_candidates`.
+    '''
+    selected = workspace[..., :len(features)]
+    columns = np.asarray(features)[positions]
+
+    return _score_memoized(scoring, subset, columns, positions,
+                           partial(_score_removals_chunk, scoring, selected),
+                           pool, n_chunks, max_calls)
+
+
+def _score_memoized(scoring, subset, columns, items, score_chunk, pool,
+                    n_chunks, max_calls=None):
+    '''
+    Score `items` with `score_chunk`, the subset of each one being
+    `subset` with the column at the same index of `columns` flipped.
+
+    Subsets are looked up in the cache before, and the new scores stored
+    in it after, all in the calling process: worker processes only get
+    the items missing from the cache, and their results are cached here
+    rather than in a copy of the cache that a process pool would throw
+    away.
+
+    Returns the same as `_score_candidates`.
+    '''
+    cache = scoring.cache
+    fn_score = np.empty(len(items))
+    missing = np.arange(len(items))
+
+    if cache is not None:
+        subset = subset.copy()
+        found = np.zeros(len(items), dtype=bool)
+
+        for k, i in enumerate(columns):
+            subset[i] = not subset[i]
+            score = cache.get(subset, None, scoring.fingerprint)
+            subset[i] = not subset[i]
+
+            if score is not None:
+                fn_score[k] = score
+                found[k] = True
+
+        missing = np.flatnonzero(~found)
+
+    scored, scores, durations = _score_chunks(
+        pool, score_chunk, np.asarray(items)[missing], n_chunks, max_calls)
+    scored = missing[scored]
+    fn_score[scored] = scores
+
+    if cache is not None:
+        for k, score in zip(scored, scores):
+            i = columns[k]
+            subset[i] = not subset[i]
+            cache.put(subset, score, scoring.fingerprint)
+            subset[i] = not subset[i]
+
+    return fn_score, len(scored), len(scored) == len(missing), durations
+
+
+def _score_chunks(pool, score_chunk, items, n_chunks, max_calls=None):
+    '''
+    Run `score_chunk(chunk, max_calls=...)` on `pool`, or serially if it
+    is None, for contiguous chunks of `items` and merge the results in
+    order.
+
+    Returns the indexes in `items` of the items scored, their scores and
+    the durations of the scorer calls.
+    '''
+    if len(items) == 0:
+        return np.array([], dtype=np.intp), [], []
+
+    # Hand the allowed calls out to the chunks in order
+    chunks = [items] if pool is None else _split(items, n_chunks)
+    allowances = [max_calls] * len(chunks)
+    if max_calls is not None:
+        ends = np.minimum(np.cumsum([len(chunk) for chunk in chunks]),
+                          max_calls)
+        allowances = np.diff(ends, prepend=0).tolist()
+
+    if pool is None:
+        results = [score_chunk(items, max_calls=allowances[0])]
+    else:
+        futures = [pool.submit(score_chunk, chunk, max_calls=allowance)
+                   for chunk, allowance in zip(chunks, allowances)]
+        results = [future.result() for future in futures]
+
+    # Each chunk scores its leading items
+    starts = np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]])
+    scored = np.concatenate([start + np.arange(len(result[0]))
+                             for start, result in zip(starts, results)])
+
+    return (scored.astype(np.intp),
+            [score for result in results for score in result[0]],
+            [duration for result in results for duration in result[1]])
+
+
+def _score_masks(scoring, selected, candidates, max_calls=None,
+                 added=True):
+    '''
+    Score every candidate column with a batched scorer, in one call.
+
+    `selected` is the boolean mask of the selected columns; the scorer
+    gets one mask per candidate with the candidate added, or removed
+    if not `added`. Subsets found
+    in the cache are left out of the batch, and when `max_calls` is
+    smaller than the rest only the first `max_calls` are scored.
+
+    Returns the same as `_score_chunk`, a batch of n subsets counting as
+    n scorer calls of equal duration.
+    '''
+    masks = np.repeat(selected[np.newaxis], len(candidates), axis=0)
+    masks[np.arange(len(candidates)), candidates] = added
+    fn_score = np.empty(len(candidates))
+    missing = np.ones(len(candidates), dtype=bool)
+
+    if scoring.cache is not None:
+        for k, mask in enumerate(masks):
+            score = scoring.cache.get(mask, None, scoring.fingerprint)
+            if score is not None:
+                fn_score[k] = score
+                missing[k] = False
+
+    missing = np.flatnonzero(missing)
+    complete = max_calls is None or len(missing) <= max_calls
+    missing = missing[:max_calls]
+
+    if len(missing) == 0 or time.monotonic() >= scoring.deadline:
+        return fn_score, 0, complete and len(missing) == 0, []
+
+    scores, duration = _score_batch(scoring.scorer, scoring.X, scoring.y,
+                                    masks[missing])
+    fn_score[missing] = scores
+
+    if scoring.cache is not None:
+        for mask, score in zip(masks[missing], scores):
+            scoring.cache.put(mask, score, scoring.fingerprint)
+
+    durations = [duration / len(missing)] * len(missing) \
+        if scoring.timed else []
+
+    return fn_score, len(missing), complete, durations
+
+
+def forward_selection(scorer, X, y, min_features=1, max_features=10,
+                      n_jobs=None, executor=None, cache=None, budget=None,
+                      checkpoint=None, resume_from=None, callback=None,
+                      floating=False):
     '''
     The Forward Selection is an algorithm used to select features.
     It starts as an empty model, and add the variable with the
@@ -12,24 +363,86 @@ def forward_selection(scorer, X, y, min_features=1, max_features=10):
     repeated and it stops when the remaining variables doesn't
     improve the accuracy of the model.
 
+    With `floating=True`, this is Sequential Floating Forward Selection
+    (SFFS): after each addition, the selection without each of the other
+    selected features is scored, and the feature whose removal gives
+    the best score is removed if that subset beats the best subset of
+    the same size found so far. Removals are repeated while they
+    improve, so a poor early pick can be undone without running
+    `recursive_feature_elimination` afterwards.
+
     Parameters
     ----------
-    scorer : function
+    scorer : function or 'linear'
         A custom user-supplied function that accepts X and y (as defined below)
         as input and returns the index of the column with the lowest weight.
+        'linear' uses a built-in least squares scorer equivalent to
+        `1 - LinearRegression().fit(X, y).score(X, y)` that updates a QR
+        factorization of the selected columns and scores all candidates
+        of a step at once; `n_jobs` and `executor` are ignored.
+        X is passed to the scorer as a reused workspace, so the scorer
+        must not keep a reference to it between calls. With a sparse X,
+        the scorer is given a CSC matrix of the columns instead, and
+        'linear' is not supported. A scorer marked with
+        `feature_selection.scoring.batched` is given all the candidates
+        of a step in one call; `n_jobs` and `executor` are then ignored.
     X : array-like of shape
-        training dataset
+        training dataset. A path to a `.npy` file is opened as a
+        read-only memory map. A `scipy.sparse` matrix is converted to
+        CSC once and never densified
     y : array-like of shape
-        test dataset
+        test dataset. A path to a `.npy` file is opened as a read-only
+        memory map
     min_features : int (default=None)
         number of minimum features to select
     max_features : int (default=10)
         number of maximum features to select
+    n_jobs : int (default=None)
+        number of workers used to score the candidates of each step.
+        None runs serially and -1 uses all CPUs
+    executor : str or concurrent.futures.Executor (default=None)
+        'thread' or 'process' to choose the kind of pool created for
+        `n_jobs` workers, or an existing executor to run the candidate
+        evaluations on. None uses a thread pool. With a process pool,
+        `scorer` must be picklable (defined at module level)
+    cache : feature_selection.ScoreCache (default=None)
+        cache of scores by dataset and feature subset, looked up before
+        calling `scorer` so subsets scored by an earlier run are not
+        fitted again. Ignored with `scorer='linear'`
+    budget : feature_selection.Budget (default=None)
+        limits on time, scorer calls and steps without improvement. When
+        a limit is reached, the features selected by the completed
+        steps are returned, possibly fewer than `min_features`. With
+        `scorer='linear'`, the vectorized scoring of a step counts as
+        one call
+    checkpoint : str (default=None)
+        path of a file the state of the run is saved to after every
+        completed step, so that an interrupted run can be resumed
+    resume_from : str (default=None)
+        path of a checkpoint saved by an earlier run on the same data;
+        the run continues after the last step it completed. It may be
+        the same path as `checkpoint`
+    callback : function (default=None)
+        called with a `feature_selection.profiling.ScorerCall` for every
+        scorer call, e.g. a `feature_selection.ProfileCollector`. Calls
+        are reported from the calling thread at the end of each step.
+        With `scorer='linear'`, the vectorized scoring of a step is
+        reported as one call
+    floating : bool (default=False)
+        whether to try removing selected features after each addition
+        (SFFS). Subsets come back when features are swapped, so their
+        scores are always memoized in the calling process, in `cache`
+        or in a private cache. The number of scorer calls varies, and is
+        capped by `budget.max_calls`, checked before every call, or
+        without it at four times the calls of a plain forward selection
+        of `max_features` features. Not supported with `scorer='linear'`
 
     Returns
     -------
     numpy ndarray
-      Numeric array of selected features
+      Numeric array of selected features. When several candidates
+      tie for the best score, the one with the lowest column index is
+      kept, whether or not the candidates were scored in parallel.
 
     Examples
     --------
@@ -49,17 +462,26 @@ def forward_selection(scorer, X, y, min_features=1, max_features=10):
 
     # Tests
     # 'scorer' must be a function
-    if not isfunction(scorer):
-        raise TypeError('scorer must be a function.')
+    if not isfunction(scorer) and not (isinstance(scorer, str) and
+                                       scorer == 'linear'):
+        raise TypeError("scorer must be a function or 'linear'.")
+
+    if _is_incremental(scorer):
+        raise TypeError('incremental scorers are only supported by '
+                        'simulated_annealing.')
+
+    # Paths to .npy files are opened as read-only memory maps
+    X = _open_npy(X)
+    y = _open_npy(y)
 
-    # Must be a numpy array or Pandas DataFrame
-    if type(X) not in {pd.DataFrame, np.ndarray}:
+    # Must be a numpy array (or memory map) or Pandas DataFrame
+    if not _is_array_like(X):
         raise TypeError('X must be a NumPy array or a Pandas DataFrame.')
 
     if len(X.shape) != 2:
         raise ValueError('X must be a 2-d array.')
 
-    if type(y) not in {pd.DataFrame, np.ndarray}:
+    if not _is_array_like(y):
         raise TypeError('y must be a NumPy array or a Pandas DataFrame.')
 
     if len(y.shape) != 1:
@@ -77,30 +499,152 @@ def forward_selection(scorer, X, y, min_features=1, max_features=10):
     if min_features < 1:
         raise TypeError('min_features should be a positive number.')
 
+    if _is_sparse(X) and isinstance(scorer, str):
+        raise TypeError("scorer='linear' does not support sparse X.")
+
+    if floating and isinstance(scorer, str):
+        raise TypeError("scorer='linear' does not support floating=True.")
+
+    # Columns are read by position; arrays and memory maps are used
+    # as is, without copies or dtype conversions
+    if isinstance(X, pd.DataFrame):
+        X = X.to_numpy()
+
+    # Sparse columns are sliced from the CSC format
+    if _is_sparse(X):
+        X = X.tocsc()
+
+    # Split each step into one chunk of candidates per worker
+    if n_jobs is None:
+        n_chunks = os.cpu_count() or 1
+    else:
+        n_chunks = _effective_n_jobs(n_jobs)
+
+    linear = _IncrementalLeastSquares(X, y) if scorer == 'linear' else None
+
+    tracker = _BudgetTracker(budget)
+    profiler = _Profiler('forward_selection', callback)
+
+    # Removals can keep a floating run going, so it is always capped
+    if floating and tracker.max_calls is None:
+        tracker.max_calls = _floating_max_calls(X.shape[1], max_features)
+
+    fingerprint = b''
+    if linear is not None:
+        cache = None
+    elif cache is not None:
+        fingerprint = cache.fingerprint(X, y, scorer, cache.scorer_key)
+    elif floating:
+        cache = ScoreCache(maxsize=None)
+
+    scoring = _Scoring(scorer, X, y, cache, fingerprint, tracker.deadline,
+                       callback is not None)
+
+    # The algorithm. A process pool gets X once per worker, not once per
+    # chunk of candidates
+    with _executor_scope(n_jobs, executor, scoring) as pool:
+        return _forward_selection(scoring, linear, tracker, profiler,
+                                  min_features, max_features, pool,
+                                  n_chunks, checkpoint, resume_from,
+                                  floating)
+
+
+def _forward_selection(scoring, linear, tracker, profiler, min_features,
+                       max_features, pool, n_chunks, checkpoint, resume_from,
+                       floating):
+    '''
+    Run the forward selection steps, scoring candidates on `pool`.
+    '''
+    scorer, X = scoring.scorer, scoring.X
+
     # Initial values
-    scores = []
-    fn_score = []
+    n_features = X.shape[1]
     ftr_select = []
-    ftr_no_select = list(range(0, X.shape[1]))
-    X_new = []
+    ftr_no_select = np.ones(n_features, dtype=bool)
+    fn_score = np.empty(n_features)
+    best_score = np.inf
     flag_keep_running = True
     flag_stop_running = False
 
-    # The algorithm
-    for j in range(0, max_features):
-        for i in ftr_no_select:
-            X_new = X[:, ftr_select + [i]]
-            fn_score.append(scorer(X_new, y))
+    # Best score found for each number of selected features, used by the
+    # floating removals
+    best_by_size = {}
+
+    # Continue from the last step completed by an interrupted run
+    if resume_from is not None:
+        state = _load_checkpoint(resume_from, 'forward_selection', X.shape)
+        ftr_select = state['ftr_select']
+        best_score = state['best_score']
+        flag_stop_running = state['flag_stop_running']
+        ftr_no_select[ftr_select] = False
+        tracker.best = best_score
+        best_by_size = {int(size): score for size, score in
+                        state.get('best_by_size', {}).items()}
+
+    # Selected columns are copied once into a contiguous workspace and
+    # the candidate column goes into the slot after them. Sparse columns
+    # are not copied, the workspace holds their indices instead. Batched
+    # scorers are given masks and need no workspace
+    batched = linear is None and _is_batched(scorer)
+    workspace = None
+    width = min(max(max_features, len(ftr_select)), n_features)
+    if linear is None and not batched:
+        workspace = np.empty(width, dtype=np.intp) if _is_sparse(X) \
+            else np.empty((X.shape[0], width), dtype=X.dtype, order='F')
+
+    for k, x in enumerate(ftr_select):
+        if linear is not None:
+            linear.add(x)
+        elif workspace is not None:
+            _select(workspace, k, X, x)
+
+    while len(ftr_select) < max_features:
+        j = len(ftr_select)
+
+        # Every feature has already been selected, or the budget is spent
+        candidates = np.flatnonzero(ftr_no_select)
+        if len(candidates) == 0 or tracker.exhausted():
+            break
+
+        fn_score.fill(np.inf)
+        if linear is not None:
+            start = time.perf_counter()
+            fn_score[candidates] = linear.score(candidates)
+            tracker.record_calls()
+            profiler.record(j, j + 1, time.perf_counter() - start)
+        else:
+            if batched:
+                step_score, n_calls, complete, durations = _score_masks(
+                    scoring, ~ftr_no_select, candidates,
+                    tracker.remaining_calls())
+            else:
+                step_score, n_calls, complete, durations = \
+                    _score_candidates(scoring, workspace, j, candidates,
+                                      pool, n_chunks, ~ftr_no_select,
+                                      tracker.remaining_calls())
+            tracker.record_calls(n_calls)
 
-        # create data frame with the scores
-        data = {'number': ftr_no_select, 'fn_score': fn_score}
-        df = pd.DataFrame(data)
+            for duration in durations:
+                profiler.record(j, j + 1, duration)
 
-        best_one = np.min(df.fn_score)
+            # The budget ran out before every candidate was scored
+            if not complete:
+                break
+
+            fn_score[candidates] = step_score
+
+        # Ties go to the first candidate, i.e. the lowest column index
+        x = int(np.argmin(fn_score))
+        best_one = fn_score[x]
+
+        # Stop if the best score has not improved for too many steps
+        tracker.update(best_one)
+        if tracker.out_of_patience():
+            break
 
         # Stop if the score doesn't decrease at least by 5%
         if (j >= 1):
-            if (((np.min(scores) - best_one) / np.min(scores)) <= 0.05):
+            if (((best_score - best_one) / best_score) <= 0.05):
                 flag_stop_running = True
 
         # Keep running the model until it reaches the minimum number of
@@ -113,12 +657,98 @@ def forward_selection(scorer, X, y, min_features=1, max_features=10):
         if (not flag_keep_running and flag_stop_running):
             break
 
-        x = df[df.fn_score == best_one].number
-        scores.append(best_one)
-        ftr_select.append(int(x))
-        ftr_no_select.remove(int(x))
+        best_score = min(best_score, best_one)
+        ftr_select.append(x)
+        ftr_no_select[x] = False
+
+        if linear is not None:
+            linear.add(x)
+        elif workspace is not None:
+            _select(workspace, j, X, x)
+
+        if floating:
+            best_by_size[j + 1] = min(best_by_size.get(j + 1, np.inf),
+                                      best_one)
+
+        # Remove features while that beats the best selection of the
+        # smaller size. Removing the new feature gives back the previous
+        # selection, which is memoized and never beats itself
+        while floating and len(ftr_select) > 2:
+            k = len(ftr_select)
+            positions = np.arange(k)
+
+            if batched:
+                removal_score, n_calls, complete, durations = _score_masks(
+                    scoring, ~ftr_no_select,
+                    np.asarray(ftr_select)[positions],
+                    tracker.remaining_calls(), added=False)
+            else:
+                removal_score, n_calls, complete, durations = \
+                    _score_removals(scoring, workspace, ftr_select,
+                                    positions, pool, n_chunks,
+                                    ~ftr_no_select,
+                                    tracker.remaining_calls())
+            tracker.record_calls(n_calls)
+
+            for duration in durations:
+                profiler.record(j, k - 1, duration)
 
-        data = {}
-        fn_score = []
+            p = int(np.argmin(removal_score))
+            if not complete or \
+                    removal_score[p] >= best_by_size.get(k - 1, np.inf):
+                break
+
+            best_score = best_by_size[k - 1] = removal_score[p]
+            ftr_no_select[ftr_select.pop(p)] = True
+            if workspace is not None:
+                workspace[..., p:k - 1] = workspace[..., p + 1:k]
+
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, 'forward_selection', X.shape, {
+                'ftr_select': ftr_select,
+                'best_score': float(best_score),
+                'flag_stop_running': flag_stop_running,
+                'best_by_size': {str(size): float(score) for size, score
+                                 in best_by_size.items()}})
+
+        # The budget ran out during the removals
+        if floating and not complete:
+            break
 
     return ftr_select
+
+
+def _floating_max_calls(n_features, max_features):
+    '''
+    Default cap on the scorer calls of a floating run: four times the
+    calls of a plain forward selection of `max_features` features.
+    '''
+    n_steps = min(max_features, n_features)
+    return 4 * sum(n_features - j for j in range(n_steps))
+
+
+def _call(scoring, X_subset, durations):
+    '''
+    Return the score of a subset of columns, given as an array or, for
+    a sparse X, as a 1d array of their indices, timing the call if
+    `scoring.timed`.
+    '''
+    if X_subset.ndim == 1:
+        X_subset = scoring.X[:, X_subset]
+
+    if not scoring.timed:
+        return scoring.scorer(X_subset, scoring.y)
+
+    score, duration = _Profiler.timed(scoring.scorer, X_subset, scoring.y)
+    durations.append(duration)
+    return score
+
+
+def _select(workspace, k, X, x):
+    '''
+    Put column `x` of X in slot `k` of the workspace.
+    '''
+    if workspace.ndim == 1:
+        workspace[k] = x
+    else:
+        workspace[:, k] = X[:, x]
@@ -0,0 +1,211 @@
+import inspect
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from feature_selection._validation import _is_array_like, _open_npy, \
+    _take_columns
+from feature_selection.recursive_feature_elimination import \
+    recursive_feature_elimination
+
+
+class SelectionPipeline:
+    """
+    Chain of selectors, each run on the features kept by the one before.
+
+    Stages are only recorded when added and run by `fit`. The pipeline
+    keeps the original positions of the surviving features, so results
+    are always reported in terms of the columns of the X given to `fit`,
+    whatever the stage returns: indexes (`variance_thresholding`,
+    `forward_selection`, ...), labels of the columns of a DataFrame
+    (`recursive_feature_elimination`) or a boolean mask
+    (`simulated_annealing(..., bools=True)`). X itself is never copied:
+    the first stage gets it as is, and each later stage gets only the
+    columns it needs, as a view when they are contiguous.
+
+    Any function taking `data`, or `X` and optionally `y`, and returning
+    indexes, labels or a boolean mask of the columns it was given can be
+    a stage. Results that are neither integers nor booleans are taken as
+    labels; integer labels are only recognised from
+    `recursive_feature_elimination`, which always returns labels. Other
+    arguments are given as keyword arguments when adding it, e.g. the
+    `scorer` of wrapper selectors.
+
+    Parameters
+    ----------
+    steps : list of tuples (default=None)
+        Stages as `(name, selector)` or `(name, selector, params)`
+        tuples, `params` being a dict of keyword arguments
+
+    Attributes
+    ----------
+    selected_ : numpy ndarray
+        Original positions of the features kept by the last stage, in
+        the order it returned them. Set by `fit`
+
+    Examples
+    --------
+    >>> from feature_selection import SelectionPipeline, forward_selection, \\
+    >>>     select_k_best, variance_thresholding
+    >>>
+    >>> pipeline = SelectionPipeline() \\
+    >>>     .add('variance', variance_thresholding, threshold=0.01) \\
+    >>>     .add('filter', select_k_best, k=100) \\
+    >>>     .add('forward', forward_selection, scorer=scorer, max_features=6)
+    >>> pipeline.fit(X, y).selected_
+    array([3, 1, 0, 4])
+    >>> pipeline.report()
+          stage  n_features_in  n_features_out   seconds
+    0  variance          10000            9984  0.061524
+    1    filter           9984             100  0.092711
+    2   forward            100               4  0.503388
+    """
+
+    def __init__(self, steps=None):
+        self.steps = []
+        for step in steps or []:
+            name, selector, *params = step
+            self.add(name, selector, **(params[0] if params else {}))
+
+    def add(self, name, selector, **params):
+        """
+        Add a stage running `selector(..., **params)` and return the
+        pipeline, so calls can be chained.
+        """
+        if not callable(selector):
+            raise TypeError('selector must be a function.')
+
+        if name in (step[0] for step in self.steps):
+            raise ValueError(f'There is already a stage named {name}.')
+
+        self.steps.append((name, selector, params))
+        return self
+
+    def fit(self, X, y=None):
+        """
+        Run every stage in turn on the features kept so far.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            A NumPy array, memory map, Pandas DataFrame, `scipy.sparse`
+            matrix or path to a `.npy` file
+
+        y : array-like of shape (n_samples,) (default=None)
+            Target, passed to the stages that take one
+
+        Returns
+        -------
+        SelectionPipeline
+            The pipeline itself
+        """
+        X = _open_npy(X)
+        y = _open_npy(y)
+
+        if not _is_array_like(X):
+            raise TypeError('X must be a NumPy array, a Pandas DataFrame or '
+                            'a sparse matrix.')
+
+        if len(X.shape) != 2:
+            raise ValueError('X must be a 2-d array.')
+
+        positions = np.arange(X.shape[1])
+        self.stats_ = []
+
+        for name, selector, params in self.steps:
+            n_features_in = len(positions)
+            start = time.perf_counter()
+
+            # Nothing left to select from
+            if n_features_in > 0:
+                X_stage = _take_columns(X, positions)
+                result = _run(selector, X_stage, y, params)
+                positions = positions[_positions(result, X_stage, selector)]
+
+            self.stats_.append({'stage': name,
+                                'n_features_in': n_features_in,
+                                'n_features_out': len(positions),
+                                'seconds': time.perf_counter() - start})
+
+        self.selected_ = positions
+        return self
+
+    def transform(self, X):
+        """
+        Return the columns of X selected by `fit`, in the same order.
+        """
+        X = _open_npy(X)
+
+        if not hasattr(self, 'selected_'):
+            raise ValueError('The pipeline must be fitted first.')
+
+        return _take_columns(X, self.selected_)
+
+    def fit_transform(self, X, y=None):
+        """
+        Run `fit` and return the selected columns of X.
+        """
+        return self.fit(X, y).transform(X)
+
+    def report(self):
+        """
+        Return the time taken by each stage of the last `fit` and the
+        number of features it got and kept, as a DataFrame.
+        """
+        if not hasattr(self, 'stats_'):
+            raise ValueError('The pipeline must be fitted first.')
+
+        return pd.DataFrame(self.stats_, columns=[
+            'stage', 'n_features_in', 'n_features_out', 'seconds'])
+
+
+def _run(selector, X, y, params):
+    """
+    Call `selector` on X, and y if it takes one, as the package's
+    selectors expect: `data` for the unsupervised ones, `X` and `y` for
+    the others.
+    """
+    try:
+        parameters = inspect.signature(selector).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+
+    if 'data' in parameters:
+        return selector(data=X, **params)
+
+    if 'X' in parameters and 'y' not in parameters:
+        return selector(X=X, **params)
+
+    if 'X' in parameters:
+        return selector(X=X, y=y, **params)
+
+    return selector(X, y, **params)
+
+
+def _positions(result, X, selector):
+    """
+    Turn the result of a stage on X into positions of X's columns.
+    """
+    result = np.asarray(result)
+
+    # Column labels, which recursive_feature_elimination returns even
+    # when they are integers
+    while isinstance(selector, partial):
+        selector = selector.func
+    if isinstance(X, pd.DataFrame) and len(result) > 0 and (
+            result.dtype.kind not in 'biu' or
+            selector is recursive_feature_elimination):
+        positions = X.columns.get_indexer(result)
+        if (positions < 0).any() or not X.columns.is_unique:
+            raise ValueError('Column labels must be unique.')
+        return positions
+
+    if result.dtype == bool:
+        if result.shape != (X.shape[1],):
+            raise ValueError('A boolean mask must have one value per '
+                             'column.')
+        return np.flatnonzero(result)
+
+    return result.astype(np.intp, copy=False)
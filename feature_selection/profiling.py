@@ -0,0 +1,128 @@
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+ScorerCall = namedtuple(
+    'ScorerCall',
+    ['selector', 'step', 'chain', 'n_features', 'duration', 'overhead'])
+ScorerCall.__doc__ = """
+Report of one scorer call, passed to a selector's `callback`.
+
+Parameters
+----------
+selector : str
+    Name of the selector that called the scorer
+
+step : int
+    Step of `forward_selection`, round of
+    `recursive_feature_elimination` or iteration of
+    `simulated_annealing` (0 for the initial subset)
+
+chain : int
+    Chain of `simulated_annealing`, 0 for the other selectors
+
+n_features : int
+    Number of features given to the scorer
+
+duration : float
+    Time spent in the scorer, in seconds
+
+overhead : float
+    Cumulative time spent by the run outside of the scorer so far, in
+    seconds. Scorer time is summed over parallel workers, so with
+    parallel scoring it can be lower than the real overhead
+"""
+
+
+class ProfileCollector:
+    """
+    Callback collecting the scorer calls of selector runs.
+
+    Pass an instance as the `callback` of `forward_selection`,
+    `recursive_feature_elimination` or `simulated_annealing`, possibly
+    for several runs, then look at `summary()` to see where time goes.
+
+    Attributes
+    ----------
+    calls : list of ScorerCall
+        Every scorer call reported so far
+
+    Examples
+    --------
+    >>> from feature_selection import ProfileCollector, forward_selection
+    >>>
+    >>> profile = ProfileCollector()
+    >>> forward_selection(scorer, X, y, 3, 6, callback=profile)
+    >>> profile.summary()
+                       calls  scorer_time  mean_latency  max_latency  ...
+    selector
+    forward_selection     34     0.046341      0.001363     0.002541  ...
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, call):
+        self.calls.append(call)
+
+    def to_frame(self):
+        """
+        Return every reported call as a row of a DataFrame.
+        """
+        return pd.DataFrame(self.calls, columns=ScorerCall._fields)
+
+    def summary(self):
+        """
+        Summarize the calls of each selector: number of calls, total,
+        mean and maximum scorer time, mean number of features and the
+        overhead outside of the scorer at the last call.
+        """
+        return self.to_frame().groupby('selector').agg(
+            calls=('duration', 'size'),
+            scorer_time=('duration', 'sum'),
+            mean_latency=('duration', 'mean'),
+            max_latency=('duration', 'max'),
+            mean_n_features=('n_features', 'mean'),
+            overhead=('overhead', 'last'))
+
+    def clear(self):
+        """
+        Forget every reported call.
+        """
+        self.calls.clear()
+
+
+class _Profiler:
+    """
+    Report the scorer calls of one selector run to `callback`.
+
+    Workers time their scorer calls with `timed` and hand the timings
+    back, and the calling thread reports them with `record`, so the
+    callback is never called concurrently or from another process.
+    """
+
+    def __init__(self, selector, callback):
+        self.selector = selector
+        self.callback = callback
+        self.start = time.perf_counter()
+        self.scorer_time = 0.0
+
+    @staticmethod
+    def timed(scorer, X, y):
+        """
+        Call the scorer and return its result with the time it took.
+        """
+        start = time.perf_counter()
+        result = scorer(X, y)
+        return result, time.perf_counter() - start
+
+    def record(self, step, n_features, duration, chain=0):
+        if self.callback is None:
+            return
+
+        self.scorer_time += duration
+        overhead = time.perf_counter() - self.start - self.scorer_time
+
+        self.callback(ScorerCall(self.selector, step, chain, n_features,
+                                 duration, overhead))
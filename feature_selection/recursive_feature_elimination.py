@@ -1,11 +1,139 @@
-from functools import reduce
 from inspect import isfunction
 
 import numpy as np
 import pandas as pd
 
+from feature_selection._checkpoint import _load_checkpoint, \
+    _save_checkpoint
+from feature_selection._validation import _is_array_like, _is_sparse, \
+    _open_npy
+from feature_selection.budget import _BudgetTracker
+from feature_selection.profiling import _Profiler
+from feature_selection.scoring import _is_batched, _is_incremental
 
-def recursive_feature_elimination(scorer, X, y, n_features_to_select=None):
+
+class _LiveColumns:
+    """
+    Index-mask engine tracking the features still in play.
+
+    The remaining columns are kept as the leading block of a working
+    array, `positions` holding the original position of each working
+    column. Eliminating a feature swaps its column with the last
+    remaining one, so every round costs only the columns eliminated and
+    the scorer is handed a view of the leading block instead of a copy
+    of the whole remaining matrix.
+
+    A writable array is copied once into a Fortran-ordered working
+    array so the leading block is contiguous. Memory maps and
+    DataFrames are never copied as a whole; the remaining columns are
+    gathered from them in the same order instead, so every input gives
+    the scorer the same columns in the same order.
+
+    Sparse matrices are converted to CSC once and the remaining columns
+    are sliced from it in their original order (see `matrix`).
+    """
+
+    def __init__(self, X):
+        self.sparse = _is_sparse(X)
+
+        if isinstance(X, pd.DataFrame):
+            self.labels = X.columns
+            self._frame = X
+            self._values = None
+        else:
+            self.labels = pd.RangeIndex(X.shape[1])
+            self._frame = None
+            if self.sparse:
+                self._values = X.tocsc()
+            elif isinstance(X, np.memmap):
+                self._values = X
+            else:
+                self._values = np.array(X, order='F')
+
+        self._in_place = self._values is not None and not self.sparse \
+            and not isinstance(self._values, np.memmap)
+        self.n_features = X.shape[1]
+        self.n_live = self.n_features
+        self.positions = np.arange(self.n_features)
+        self._slots = np.arange(self.n_features)
+        self._position_of = {label: i for i, label in enumerate(self.labels)}
+
+    def live_positions(self):
+        """
+        Original positions of the remaining features, in working order.
+        """
+        return self.positions[:self.n_live]
+
+    def mask(self):
+        """
+        Boolean mask of the remaining features over the original columns.
+        """
+        mask = np.zeros(self.n_features, dtype=bool)
+        mask[self.live_positions()] = True
+        return mask
+
+    def frame(self):
+        """
+        DataFrame of the remaining features, labelled by column name.
+        """
+        live = self.live_positions()
+
+        if self._frame is not None:
+            return self._frame.iloc[:, live]
+
+        values = self._values[:, :self.n_live] if self._in_place \
+            else self._values[:, live]
+
+        return pd.DataFrame(values, columns=self.labels[live], copy=False)
+
+    def scored_positions(self):
+        """
+        Original positions of the columns handed to the scorer, in the
+        order it sees them.
+        """
+        if self.sparse:
+            return np.flatnonzero(self.mask())
+        return self.live_positions()
+
+    def matrix(self, positions):
+        """
+        CSC matrix of the given original columns of a sparse X.
+        """
+        return self._values[:, positions]
+
+    def position(self, label):
+        """
+        Original position of the feature named `label`.
+        """
+        return self._position_of[label]
+
+    def remove(self, positions):
+        """
+        Eliminate the features at the given original positions.
+        """
+        for position in positions:
+            slot = self._slots[position]
+            last = self.n_live - 1
+            moved = self.positions[last]
+
+            if self._in_place:
+                self._values[:, [slot, last]] = self._values[:, [last, slot]]
+
+            self.positions[[slot, last]] = moved, position
+            self._slots[[moved, position]] = slot, last
+            self.n_live -= 1
+
+    def kept(self):
+        """
+        Labels of the remaining features, in their original order.
+        """
+        return self.labels[np.sort(self.live_positions())].tolist()
+
+
+def recursive_feature_elimination(scorer, X, y, n_features_to_select=None,
+                                  cache=None, step=1, budget=None,
+                                  checkpoint=None, resume_from=None,
+                                  callback=None):
     """
     Feature selector that implements recursive feature elimination
 
@@ -18,17 +146,59 @@ def recursive_feature_elimination(scorer, X, y, n_features_to_select=None):
     scorer : function
         A custom user-supplied function that accepts X and y (as defined below)
         as input and returns the index of the column with the lowest weight.
+        Alternatively, it may return a list, array or Series with one
+        importance per column of the X it was given, in the same order;
+        the columns with the lowest importances are eliminated first,
+        the leftmost one on ties. The remaining columns are handed to the
+        scorer as a view, not a copy, and not necessarily in their
+        original order, so identify them by name. With a sparse X, the
+        scorer is given a CSC matrix of the remaining columns in their
+        original order and returns the position of a column in it, or
+        importances.
 
     X : array-like of shape (n_samples, n_features)
-        Training samples
+        Training samples. A path to a `.npy` file is opened as a
+        read-only memory map. A `scipy.sparse` matrix is converted to
+        CSC once and never densified
 
     y : array-like of shape (n_samples,) or (n_samples, n_outputs)
-        True values for X, used for training
+        True values for X, used for training. A path to a `.npy` file
+        is opened as a read-only memory map
 
     n_features_to_select : int or None (default=None)
         The number of features to be selected. If None, half the number
         of features are selected.
 
+    cache : feature_selection.ScoreCache (default=None)
+        Cache of scorer results by dataset and feature subset, looked up
+        before calling `scorer` so subsets seen by an earlier run are not
+        fitted again.
+
+    step : int or float (default=1)
+        Number of features eliminated per call to `scorer` if an int, or
+        fraction of the remaining features if a float between 0 and 1
+        (at least one feature is eliminated). Eliminating more than one
+        feature per round requires a scorer that returns importances.
+
+    budget : feature_selection.Budget (default=None)
+        Limits on time and scorer calls. When a limit is reached, the
+        features remaining at that point are returned, which are more
+        than `n_features_to_select`. `patience` is ignored since the
+        scorer does not return scores.
+
+    checkpoint : str (default=None)
+        Path of a file the state of the run is saved to after every
+        round, so that an interrupted run can be resumed.
+
+    resume_from : str (default=None)
+        Path of a checkpoint saved by an earlier run on the same data.
+        The features it had eliminated are dropped and the run continues
+        from there. It may be the same path as `checkpoint`.
+
+    callback : function (default=None)
+        Called with a `feature_selection.profiling.ScorerCall` after
+        every scorer call, e.g. a `feature_selection.ProfileCollector`.
+
     Returns
     -------
     array of shape [n_features_to_select]
@@ -54,49 +224,153 @@ def recursive_feature_elimination(scorer, X, y, n_features_to_select=None):
     if not isfunction(scorer):
         raise TypeError('scorer must be a function.')
 
-    # Must be a numpy array or Pandas DataFrame
-    if type(X) not in {pd.DataFrame, np.ndarray}:
+    if _is_batched(scorer) or _is_incremental(scorer):
+        raise TypeError('batched and incremental scorers are not supported '
+                        'by recursive_feature_elimination.')
+
+    # Paths to .npy files are opened as read-only memory maps
+    X = _open_npy(X)
+    y = _open_npy(y)
+
+    # Must be a numpy array (or memory map) or Pandas DataFrame
+    if not _is_array_like(X):
         raise TypeError('X must be a a NumPy array or a Pandas DataFrame.')
 
     if len(X.shape) != 2:
         raise ValueError('X must be a 2-d array.')
 
-    if type(y) not in {pd.DataFrame, np.ndarray}:
+    if not _is_array_like(y):
         raise TypeError('y must be a a NumPy array or a Pandas DataFrame.')
 
     if X.shape[0] != y.shape[0]:
         raise ValueError(f'X and y have inconsistent numbers of samples: '
                          '[{X.shape[0]}, {y.shape[0]}]')
 
-    # Convert to Pandas DataFrame so that we can keep track of columns
-    # by their column names. Pandas will assign column names 0, 1, etc.
-    # Array indices are no good because they keep changing as we remove
-    # columns.
-    all_features = pd.DataFrame(X) if isinstance(X, np.ndarray) else X
+    n_features = X.shape[1]
 
-    if n_features_to_select >= all_features.shape[1]:
+    if n_features_to_select is None:
+        n_features_to_select = n_features // 2
+
+    if n_features_to_select >= n_features:
         raise ValueError('n_features_to_select must be less then the number '
                          'of input features.')
 
-    eliminated_features = []
+    if not (isinstance(step, (int, np.integer)) and step >= 1) and \
+            not (isinstance(step, float) and 0 < step < 1):
+        raise ValueError('step must be a positive integer or a float '
+                         'between 0 and 1.')
+
+    # The scorer sees Pandas DataFrames so that we can keep track of
+    # columns by their column names. Pandas will assign column names
+    # 0, 1, etc. to arrays.
+    live = _LiveColumns(X)
+    eliminated = []
+
+    # Continue from the last round completed by an interrupted run
+    if resume_from is not None:
+        state = _load_checkpoint(resume_from, 'recursive_feature_elimination',
+                                 X.shape)
+        eliminated = state['eliminated']
+        live.remove(eliminated)
 
-    for i in range(1, X.shape[1]):
-        # Remove currently eliminated features
-        features_to_try = all_features.drop(columns=eliminated_features)
+    fingerprint = b''
+    if cache is not None:
+        fingerprint = cache.fingerprint(X, y, scorer, cache.scorer_key)
 
-        # Get the next feature to remove
-        feature_to_remove = scorer(features_to_try, y)
-        eliminated_features.append(feature_to_remove)
+    tracker = _BudgetTracker(budget)
+    tracker.patience = None
+    profiler = _Profiler('recursive_feature_elimination', callback)
+    n_rounds = 0
 
-        # If we have our target number of features, stop.
-        if len(eliminated_features) + n_features_to_select >= X.shape[1]:
-            break
+    # Stop once we have our target number of features, or when the
+    # budget is spent
+    while live.n_live > n_features_to_select and not tracker.exhausted():
+        n_to_remove = step if isinstance(step, (int, np.integer)) \
+            else max(1, int(step * live.n_live))
+        n_to_remove = min(n_to_remove, live.n_live - n_features_to_select)
+
+        positions = live.scored_positions()
+
+        # Look the subset of remaining features up in the cache first
+        result = None
+        if cache is not None:
+            remaining = live.mask()
+            result = cache.get(remaining, None, fingerprint)
+            if result is not None:
+                result = _reorder(result, positions, cached=True)
+
+        if result is None:
+            # Get the next feature(s) to remove
+            X_live = live.matrix(positions) if live.sparse else live.frame()
+            result, duration = _Profiler.timed(scorer, X_live, y)
+            tracker.record_calls()
+            profiler.record(n_rounds, live.n_live, duration)
+
+            if cache is not None:
+                cache.put(remaining, _reorder(result, positions), fingerprint)
+
+        to_remove = _features_to_remove(result, live, positions,
+                                        n_to_remove)
+        live.remove(to_remove)
+        eliminated.extend(int(position) for position in to_remove)
+        n_rounds += 1
+
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, 'recursive_feature_elimination',
+                             X.shape, {'eliminated': eliminated})
 
     # Return a list of the features to keep
-    eliminated_features = set(eliminated_features)
+    return live.kept()
+
+
+def _reorder(result, positions, cached=False):
+    """
+    Put the importances returned by the scorer for the columns at the
+    original `positions` in the order of the original columns, as they
+    are cached, since the same subset of columns can be handed to the
+    scorer in another order by another run. With `cached`, put cached
+    importances back in the order of `positions` instead. Column labels
+    and positions in a sparse matrix, whose columns are always in their
+    original order, are returned as is.
+    """
+    if not isinstance(result, (list, np.ndarray, pd.Series)) or \
+            len(result) != len(positions):
+        return result
+
+    order = np.argsort(positions)
+    importances = np.asarray(result)
+
+    if not cached:
+        return importances[order]
+
+    reordered = np.empty_like(importances)
+    reordered[order] = importances
+    return reordered
+
+
+def _features_to_remove(result, live, positions, n_to_remove):
+    """
+    Turn the result of the scorer on the remaining features `live`, the
+    columns at the original `positions`, into the original positions of
+    the `n_to_remove` features to eliminate.
+    """
+    if isinstance(result, (list, np.ndarray, pd.Series)):
+        importances = np.asarray(result)
+
+        if importances.shape != positions.shape:
+            raise ValueError('scorer must return a column label or one '
+                             'importance per column.')
+
+        # The leftmost original column is eliminated on ties
+        order = np.lexsort((positions, importances))
+        return positions[order[:n_to_remove]].copy()
+
+    if n_to_remove > 1:
+        raise ValueError('step eliminates more than one feature per round, '
+                         'so scorer must return one importance per column.')
 
-    kept_features = reduce(
-        lambda acc, col: acc if col in eliminated_features else acc + [col],
-        all_features.columns, [])
+    # The scorer of a sparse X returns a position in the matrix it got
+    if live.sparse:
+        return [positions[result]]
 
-    return list(kept_features)
+    return [live.position(result)]
@@ -0,0 +1,324 @@
+import copy
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from feature_selection._parallel import _effective_n_jobs
+
+
+def cv_scorer(estimator, n_splits=5, shuffle=False, random_state=None,
+              n_jobs=None, metric=None):
+    """
+    Build a cross-validated scorer for `forward_selection` and
+    `simulated_annealing`.
+
+    The returned scorer fits a copy of `estimator` on each of `n_splits`
+    folds of the columns it is given and returns the mean validation
+    error, so lower is better. The fold indices are computed once per
+    number of samples and reused by every call, the folds of a call are
+    fitted in parallel on a thread pool, and the training and validation
+    rows of contiguous arrays are gathered into per-thread buffers that
+    are reused across calls instead of being reallocated for every
+    subset.
+
+    Parameters
+    ----------
+    estimator : object
+        A scikit-learn style estimator with `fit`, and `score` or
+        `predict`. It is deep-copied before each fit, so it is never
+        modified.
+
+    n_splits : int (default=5)
+        Number of folds, at least 2
+
+    shuffle : bool (default=False)
+        If true, samples are shuffled before being split into folds
+
+    random_state : int (default=None)
+        Seed of the shuffle
+
+    n_jobs : int (default=None)
+        Number of threads fitting folds in parallel. None fits one fold
+        per thread, up to the number of folds, and -1 uses all CPUs
+
+    metric : function (default=None)
+        Function of `(y_true, y_pred)` returning the validation error of
+        a fold. None uses `1 - estimator.score(X, y)`
+
+    Returns
+    -------
+    function
+        A scorer accepting X and y and returning the mean validation
+        error across folds. It can be called concurrently from threads
+        but, being a closure, cannot be sent to a process pool. Its
+        thread pool is shut down when the scorer is garbage collected,
+        or earlier by calling `scorer.close()`, after which the scorer
+        cannot be called anymore.
+
+    Examples
+    --------
+    >>> from sklearn.datasets import make_friedman1
+    >>> from sklearn.linear_model import LinearRegression
+    >>> from feature_selection import forward_selection
+    >>> from feature_selection.scoring import cv_scorer
+    >>>
+    >>> X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    >>> scorer = cv_scorer(LinearRegression(), n_splits=5)
+    >>> forward_selection(scorer, X, y, 3, 6)
+    [3, 1, 0, 4]
+    """
+    if n_splits < 2:
+        raise ValueError('n_splits must be at least 2.')
+
+    if metric is not None and not callable(metric):
+        raise TypeError('metric must be a function.')
+
+    n_workers = n_splits if n_jobs is None else _effective_n_jobs(n_jobs)
+    lock = threading.Lock()
+    folds = {}
+    buffers = threading.local()
+    pool = {'executor': None, 'closed': False}
+
+    def get_folds(n_samples):
+        with lock:
+            if n_samples not in folds:
+                folds[n_samples] = _kfold(n_samples, n_splits, shuffle,
+                                          random_state)
+            return folds[n_samples]
+
+    def get_pool():
+        with lock:
+            if pool['closed']:
+                raise ValueError('The scorer has been closed.')
+            if pool['executor'] is None:
+                pool['executor'] = ThreadPoolExecutor(max_workers=n_workers)
+            return pool['executor']
+
+    def fit_fold(X, y, train, test):
+        X_train = _take_rows(buffers, 'train', X, train)
+        X_test = _take_rows(buffers, 'test', X, test)
+        model = copy.deepcopy(estimator).fit(X_train, y[train])
+
+        if metric is None:
+            return 1 - model.score(X_test, y[test])
+
+        return metric(y[test], model.predict(X_test))
+
+    def scorer(X, y):
+        X = np.asarray(X)
+        y = np.asarray(y)
+        splits = get_folds(X.shape[0])
+
+        if n_workers == 1:
+            errors = [fit_fold(X, y, train, test) for train, test in splits]
+        else:
+            futures = [get_pool().submit(fit_fold, X, y, train, test)
+                       for train, test in splits]
+            errors = [future.result() for future in futures]
+
+        return float(np.mean(errors))
+
+    # The pool must not refer to the scorer, or it would never be
+    # collected
+    scorer.close = weakref.finalize(scorer, _shutdown, pool, lock)
+
+    return scorer
+
+
+def _shutdown(pool, lock):
+    """
+    Shut down the thread pool of a `cv_scorer` scorer.
+    """
+    with lock:
+        pool['closed'] = True
+        if pool['executor'] is not None:
+            pool['executor'].shutdown(wait=False)
+            pool['executor'] = None
+
+
+def batched(scorer):
+    """
+    Mark `scorer` as a batched scorer, which scores many feature subsets
+    in one call.
+
+    A batched scorer is called as `scorer(X, y, masks)` with the whole
+    X and a 2-d boolean array `masks` of shape (n_subsets, n_features),
+    one row per subset to score, and returns one score per row. Lower is
+    better, as for other scorers. `forward_selection` passes it every
+    candidate of a step at once and `simulated_annealing` every proposal
+    of a batch, so the scorer can share work between the subsets, e.g.
+    fit them in one vectorized operation.
+
+    Parameters
+    ----------
+    scorer : function
+        The function to mark. It is returned unchanged apart from a
+        `batched` attribute set to True, so it can be used as a decorator
+
+    Returns
+    -------
+    function
+        `scorer`
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from feature_selection import forward_selection
+    >>> from feature_selection.scoring import batched
+    >>>
+    >>> @batched
+    >>> def scorer(X, y, masks):
+    >>>     return np.array([np.linalg.lstsq(X[:, mask], y, rcond=None)[1][0]
+    >>>                      for mask in masks])
+    >>>
+    >>> forward_selection(scorer, X, y, 3, 6)
+    [3, 1, 0, 4]
+    """
+    scorer.batched = True
+    return scorer
+
+
+def incremental(scorer):
+    """
+    Mark `scorer` as an incremental scorer, which updates an earlier fit
+    instead of fitting each subset from scratch.
+
+    `simulated_annealing` proposals differ from the current features by
+    a few columns only. An incremental scorer is called as
+    `scorer(X, y, mask, state, added, removed)` with the whole X, the
+    boolean `mask` of the subset to score, and the `state` it returned
+    for the current features along with the indices of the columns
+    `added` to and `removed` from them. It returns `(score, state)`,
+    the new state describing the fit of `mask`, e.g. a Gram matrix or a
+    warm-started model. `state` is None when there is no earlier fit to
+    update, for the first subset or after a score answered by a cache;
+    `added` then holds every column of `mask` and `removed` is empty.
+
+    Parameters
+    ----------
+    scorer : function
+        The function to mark. It is returned unchanged apart from an
+        `incremental` attribute set to True, so it can be used as a
+        decorator
+
+    Returns
+    -------
+    function
+        `scorer`
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from feature_selection import simulated_annealing
+    >>> from feature_selection.scoring import incremental
+    >>>
+    >>> @incremental
+    >>> def scorer(X, y, mask, state, added, removed):
+    >>>     # Keep X.T @ X and X.T @ y of the whole X, computed once
+    >>>     gram, xty = state or (X.T @ X, X.T @ y)
+    >>>     coef = np.linalg.lstsq(gram[np.ix_(mask, mask)], xty[mask],
+    >>>                            rcond=None)[0]
+    >>>     rss = y @ y - xty[mask] @ coef
+    >>>     return rss, (gram, xty)
+    >>>
+    >>> simulated_annealing(scorer, X, y)
+    array([0, 1, 3, 4])
+    """
+    scorer.incremental = True
+    return scorer
+
+
+def _is_incremental(scorer):
+    """
+    Whether `scorer` was marked with `incremental`.
+    """
+    return getattr(scorer, 'incremental', False) is True
+
+
+def _is_batched(scorer):
+    """
+    Whether `scorer` was marked with `batched`.
+    """
+    return getattr(scorer, 'batched', False) is True
+
+
+def _score_batch(scorer, X, y, masks):
+    """
+    Call a batched scorer on `masks` and return its scores as an array,
+    with the time the call took.
+    """
+    start = time.perf_counter()
+    scores = np.asarray(scorer(X, y, masks), dtype=float)
+    duration = time.perf_counter() - start
+
+    if scores.shape != (len(masks),):
+        raise ValueError('A batched scorer must return one score per '
+                         'subset.')
+
+    return scores, duration
+
+
+def _kfold(n_samples, n_splits, shuffle, random_state):
+    """
+    Split sample indices into `n_splits` (train, test) folds of nearly
+    equal size, like scikit-learn's `KFold`.
+    """
+    if n_samples < n_splits:
+        raise ValueError('n_splits cannot be greater than the number of '
+                         'samples.')
+
+    indices = np.arange(n_samples)
+    if shuffle:
+        indices = np.random.default_rng(random_state).permutation(n_samples)
+
+    splits = []
+    for test in np.array_split(indices, n_splits):
+        train = np.setdiff1d(indices, test, assume_unique=True)
+        splits.append((np.sort(train), np.sort(test)))
+
+    return splits
+
+
+def _take_rows(buffers, role, X, rows):
+    """
+    Gather `X[rows]` into a buffer owned by the calling thread, in the
+    memory order of X. Buffers are kept per role ('train' or 'test') and
+    dtype, and grown to fit more values, so repeated calls reuse them
+    instead of allocating.
+
+    `np.take` only writes into its output without a temporary copy when
+    both are contiguous in the same order and the indices are not
+    checked, so a C-ordered X is gathered into a C-ordered buffer and a
+    Fortran-ordered one through the transposes, in 'clip' mode since
+    `rows` are valid. Other arrays are simply indexed.
+    """
+    if X.flags.c_contiguous:
+        transpose = False
+    elif X.flags.f_contiguous:
+        transpose = True
+    else:
+        return X[rows]
+
+    if not hasattr(buffers, 'by_role'):
+        buffers.by_role = {}
+
+    key = (role, X.dtype)
+    buffer = buffers.by_role.get(key)
+    size = len(rows) * X.shape[1]
+
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size if buffer is None
+                          else max(size, 2 * buffer.size), dtype=X.dtype)
+        buffers.by_role[key] = buffer
+
+    if transpose:
+        out = buffer[:size].reshape(X.shape[1], len(rows))
+        np.take(X.T, rows, axis=1, out=out, mode='clip')
+        return out.T
+
+    out = buffer[:size].reshape(len(rows), X.shape[1])
+    np.take(X, rows, axis=0, out=out, mode='clip')
+    return out
@@ -1,11 +1,24 @@
-import random
+import os
+import time
 from inspect import isfunction
 
 import numpy as np
 import pandas as pd
 
+from feature_selection._parallel import _Resident, _executor_scope
+from feature_selection._validation import _is_array_like, _is_sparse, \
+    _open_npy
+from feature_selection.budget import _BudgetTracker
+from feature_selection.profiling import _Profiler
+from feature_selection.scoring import _is_batched, _is_incremental, \
+    _score_batch
 
-def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False, random_state=None):
+
+def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False,
+                        random_state=None, n_chains=1, n_jobs=None,
+                        executor=None, return_traces=False, cache=None,
+                        budget=None, callback=None, batch_size=1,
+                        temperatures=None, swap_interval=10):
     """
     Feature selector that performs simmulated annealing to select features.
 
@@ -21,13 +34,23 @@ def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False, random_s
     ----------
     scorer : function
         A custom user-supplied function that accepts X and y (as defined below)
-        as input and returns the error of the datasets.
+        as input and returns the error of the datasets. A scorer marked
+        with `feature_selection.scoring.batched` is given all the
+        proposals of an iteration in one call, and one marked with
+        `feature_selection.scoring.incremental` is given the columns
+        each proposal adds and removes so it can update its last fit.
+        The columns of X are gathered into a workspace reused across
+        calls, so the scorer must not keep a reference to it.
 
     X : np.array
-        Feature training dataset
+        Feature training dataset. A path to a `.npy` file is opened as
+        a read-only memory map. A `scipy.sparse` matrix is converted to
+        CSC once and the scorer is given CSC matrices of the selected
+        columns
 
     y : np.array
-        Target training dataset
+        Target training dataset. A path to a `.npy` file is opened as a
+        read-only memory map
 
     c : int (default=1)
         Control rate of feature perturbation
@@ -40,13 +63,82 @@ def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False, random_s
         column indicies
 
     random_state : int (default=None)
-        Seed for random number generators
+        Seed for random number generators. Each chain draws from its own
+        `np.random.Generator` spawned from this seed; the global `random`
+        and `np.random` states are left untouched
+
+    n_chains : int (default=1)
+        Number of independent chains to run. The chain with the lowest
+        final score is returned
+
+    n_jobs : int (default=None)
+        Number of workers running chains concurrently. None runs the
+        chains serially and -1 uses all CPUs
+
+    executor : str or concurrent.futures.Executor (default=None)
+        'process' or 'thread' to choose the kind of pool created for
+        `n_jobs` workers, or an existing executor to run the chains on.
+        None uses a process pool, which requires a picklable `scorer`
+        (defined at module level)
+
+    return_traces : bool (default=False)
+        If true, also return the score of the accepted features after
+        every iteration, for each chain
+
+    cache : feature_selection.ScoreCache (default=None)
+        Cache of scores by dataset and feature subset. Revisited subsets
+        are looked up instead of being scored again, and the cache's
+        `hits` and `misses` counters show how many scorer calls were
+        saved. Chains run in worker processes use a copy of the cache
+        taken when the pool starts, and their new scores and counters
+        are merged into `cache` after every segment
+
+    budget : feature_selection.Budget (default=None)
+        Limits on time, scorer calls and iterations without improvement
+        of the best score. A chain that reaches a limit stops and
+        returns the best features it has seen. `max_time` is measured
+        from the start of the run for every chain, `max_calls` is split
+        evenly between the chains (or replicas), and `patience` applies
+        to each chain separately. Every chain scores its initial
+        features, so a run makes at least one call per chain
+
+    callback : function (default=None)
+        Called with a `feature_selection.profiling.ScorerCall` for every
+        scorer call, e.g. a `feature_selection.ProfileCollector`. Calls
+        are reported from the calling thread once their chain finishes,
+        chain by chain, so it also works with a process pool
+
+    batch_size : int (default=1)
+        Number of proposals drawn from the current features and scored
+        at each iteration. The best one goes through the usual
+        acceptance rule. A batch is always scored whole, so a chain can
+        exceed its share of `budget.max_calls` by up to
+        `batch_size - 1` calls
+
+    temperatures : list of float (default=None)
+        Values of `c`, one per replica, to run in replica-exchange
+        (parallel tempering) mode instead of independent chains. The
+        replicas run concurrently like chains and, every `swap_interval`
+        iterations, neighbouring replicas in the list offer to exchange
+        their current features, so give the values in increasing order.
+        Hot replicas (large `c`) explore while cold ones refine the best
+        subsets. The best features seen by any replica are returned. `c`
+        is ignored and `n_chains` must be 1
+
+    swap_interval : int (default=10)
+        Number of iterations between two exchanges of replicas
 
     Returns
     -------
     numpy.array
         Array of selected features indicies
 
+    list of numpy.array
+        Only if `return_traces` is true: for each chain, an array of
+        length `iterations + 1` with the initial score followed by the
+        accepted score after each iteration, shorter if the chain was
+        stopped by `budget`
+
     Examples
     --------
     >>> from sklearn.datasets import make_friedman1
@@ -66,14 +158,21 @@ def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False, random_s
     if not isfunction(scorer):
         raise TypeError('scorer must be a function.')
 
-    # Must be a numpy array or Pandas DataFrame
-    if type(X) not in {pd.DataFrame, np.ndarray}:
+    if _is_batched(scorer) and _is_incremental(scorer):
+        raise TypeError('scorer cannot be both batched and incremental.')
+
+    # Paths to .npy files are opened as read-only memory maps
+    X = _open_npy(X)
+    y = _open_npy(y)
+
+    # Must be a numpy array (or memory map) or Pandas DataFrame
+    if not _is_array_like(X):
         raise TypeError('X must be a NumPy array or a Pandas DataFrame.')
 
     if len(X.shape) != 2:
         raise ValueError('X must be a 2-d array.')
 
-    if type(y) not in {pd.DataFrame, np.ndarray}:
+    if not _is_array_like(y):
         raise TypeError('y must be a NumPy array or a Pandas DataFrame.')
 
     if X.shape[0] != y.shape[0]:
@@ -81,52 +180,401 @@ def simulated_annealing(scorer, X, y, c=1, iterations=100, bools=False, random_s
             f'X and y have inconsistent numbers of samples: '
             '[{X.shape[0]}, {y.shape[0]}]')
 
-    # Set mutate percentage
-    mutate = 0.05
-
-    # Set random state
-    np.random.seed(random_state)
-    random.seed(random_state)
-
-    # Obtain initial array of randomly selected features
-    ftr_all = np.arange(0, X.shape[1])
-    ftr_old = np.array([])
-    while ftr_old.sum() == 0:
-        ftr_old = np.random.binomial(1, 0.5, size=X.shape[1]).astype('bool')
-    score_old = scorer(X[:, ftr_old], y)
-
-    # Iterate through new versions of selected features
-    for i in range(0, iterations):
-        ftr_new = ftr_old.copy()
-        ftr_mutate = np.array(
-            random.sample(
-                list(ftr_all), int(
-                    np.ceil(
-                        X.shape[1] * mutate))))
-        for f in ftr_mutate:
-            ftr_new[f] = not ftr_new[f]
-        # Make sure new selected features has at least one feature
-        if ftr_new.sum() != 0:
-            score_new = scorer(X[:, ftr_new], y)
-            if score_new < score_old:
-                ftr_old = ftr_new
-                score_old = score_new
+    if n_chains < 1:
+        raise ValueError('n_chains must be a positive number.')
+
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive number.')
+
+    if temperatures is not None:
+        if n_chains != 1:
+            raise ValueError('n_chains must be 1 with temperatures.')
+
+        if len(temperatures) == 0 or min(temperatures) <= 0:
+            raise ValueError('temperatures must be a non-empty list of '
+                             'positive numbers.')
+
+    if swap_interval < 1:
+        raise ValueError('swap_interval must be a positive number.')
+
+    # Columns are read by position; arrays and memory maps are used
+    # as is, without copies or dtype conversions
+    if isinstance(X, pd.DataFrame):
+        X = X.to_numpy()
+
+    # Sparse columns are sliced from the CSC format
+    if _is_sparse(X):
+        X = X.tocsc()
+
+    # Every chain gets its own independent generator, so chains never
+    # share or touch the global random state. Replica exchange draws its
+    # swaps from one more generator
+    tempering = temperatures is not None
+    if tempering:
+        seeds = np.random.SeedSequence(random_state).spawn(
+            len(temperatures) + 1)
+        swap_rng = np.random.default_rng(seeds.pop())
+    else:
+        seeds = np.random.SeedSequence(random_state).spawn(n_chains)
+        temperatures = [c] * n_chains
+
+    fingerprint = b''
+    if cache is not None:
+        fingerprint = cache.fingerprint(X, y, scorer, cache.scorer_key)
+
+    profiler = _Profiler('simulated_annealing', callback)
+    annealing = _Annealing(scorer, X, y, c, iterations, cache, fingerprint,
+                           budget, time.monotonic(), callback is not None,
+                           batch_size)
+    chains = [_Chain(annealing, seed, c_, max_calls)
+              for seed, c_, max_calls in zip(
+                  seeds, temperatures,
+                  _split_calls(budget, len(temperatures)))]
+
+    # Independent chains run in one segment, replicas in segments of
+    # `swap_interval` iterations with an exchange after each one
+    interval = swap_interval if tempering else max(iterations, 1)
+
+    with _executor_scope(n_jobs, executor or 'process', annealing) as pool:
+        for n_swaps, start in enumerate(range(0, max(iterations, 1),
+                                              interval)):
+            stop = min(start + interval, iterations)
+
+            if pool is None:
+                chains = [_run_chain(annealing, chain, stop)
+                          for chain in chains]
             else:
-                # Determine probability of acceptance
-                p_accept = np.exp(
-                    (-i / c) * ((score_new - score_old) / score_old))
-                if np.random.random() > p_accept:
-                    pass
-                else:
-                    ftr_old = ftr_new
-                    score_old = score_new
+                futures = [pool.submit(_run_chain, annealing, chain, stop)
+                           for chain in chains]
+                chains = [future.result() for future in futures]
+
+            for k, chain in enumerate(chains):
+                for step, n_features, duration in chain.timings:
+                    profiler.record(step, n_features, duration, k)
+                chain.timings = []
+
+                # Scores and counts of chains run in worker processes
+                if cache is not None:
+                    for mask, score in chain.cached:
+                        cache.put(mask, score, fingerprint)
+                    cache._count(chain.cache_hits, chain.cache_misses)
+                    chain.cached = []
+                    chain.cache_hits = chain.cache_misses = 0
 
-    # Reset random state
-    np.random.seed(None)
-    random.seed(None)
+            if tempering and stop < iterations:
+                _exchange(chains, stop, n_swaps % 2, swap_rng)
+
+    if tempering:
+        # The best features seen by any replica, the first one on ties
+        best = int(np.argmin([chain.score_best for chain in chains]))
+        ftr_old = chains[best].ftr_best
+    else:
+        # Keep the chain with the lowest final score, the first one on
+        # ties
+        results = [chain.result() for chain in chains]
+        best = int(np.argmin([score for _, score, _ in results]))
+        ftr_old = results[best][0]
 
     # Return either feature indicies or booleans
     if bools:
-        return ftr_old
+        result = ftr_old
     else:
-        return ftr_all[ftr_old]
+        result = np.arange(0, X.shape[1])[ftr_old]
+
+    if return_traces:
+        return result, [chain.result()[2] for chain in chains]
+
+    return result
+
+
+class _Annealing(_Resident):
+    """
+    Settings shared by every chain of a run, bundled so they can be sent
+    to worker threads or processes in a single argument. Process pools
+    created by `simulated_annealing` receive them once per worker rather
+    than with every segment, see `_Resident`.
+    """
+
+    def __init__(self, scorer, X, y, c, iterations, cache=None,
+                 fingerprint=b'', budget=None, start=None, timed=False,
+                 batch_size=1):
+        self.scorer = scorer
+        self.X = X
+        self.y = y
+        self.c = c
+        self.iterations = iterations
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.budget = budget
+        self.start = start
+        self.timed = timed
+        self.batch_size = batch_size
+
+
+class _Chain:
+    """
+    State of a single annealing chain seeded with `seed` and run at
+    temperature `c`.
+
+    The chain is advanced in segments by `run`, possibly in worker
+    threads or processes, so that replicas can exchange their current
+    features between segments. Scores are looked up in the cache when
+    one is given, and when `annealing.timed`, `timings` collects the
+    (iteration, n_features, duration) of every scorer call.
+
+    `state_old` is the state an incremental scorer returned for
+    `ftr_old`, or None if it has to start from scratch. `max_calls` is
+    the chain's share of `budget.max_calls`.
+
+    A chain run in another process than the one it was created in only
+    sees a copy of the cache, so it also keeps the scores it adds to the
+    cache in `cached`, and counts its lookups in `cache_hits` and
+    `cache_misses`, for the caller to merge into its cache.
+    """
+
+    def __init__(self, annealing, seed, c, max_calls=None):
+        self.rng = np.random.default_rng(seed)
+        self.c = c
+        self.tracker = _BudgetTracker(annealing.budget, annealing.start)
+        self.tracker.max_calls = max_calls
+        self.pid = os.getpid()
+        self.cached = []
+        self.cache_hits = self.cache_misses = 0
+        self.i = 0
+        self.stopped = False
+        self.ftr_old = self.score_old = self.state_old = None
+        self.ftr_best = self.score_best = None
+        self.trace = np.empty(annealing.iterations + 1)
+        self.timings = []
+        self._workspace = None
+
+    def __getstate__(self):
+        # The workspace is scratch space, not worth sending to a worker
+        state = self.__dict__.copy()
+        state['_workspace'] = None
+        return state
+
+    def columns(self, X, mask):
+        """
+        Return `X[:, mask]`, gathered into a C-ordered workspace that is
+        reused across proposals instead of a new array per proposal.
+        """
+        if not isinstance(X, np.ndarray):
+            return X[:, mask]
+
+        columns = np.flatnonzero(mask)
+        size = X.shape[0] * len(columns)
+
+        if self._workspace is None or self._workspace.dtype != X.dtype or \
+                self._workspace.size < size:
+            self._workspace = np.empty(
+                min(2 * size, X.size) if self._workspace is not None
+                else size, dtype=X.dtype)
+
+        out = self._workspace[:size].reshape(X.shape[0], len(columns))
+        np.take(X, columns, axis=1, out=out, mode='clip')
+
+        return out
+
+    def score(self, annealing, masks, step):
+        """
+        Score every row of the boolean array `masks`.
+
+        Returns the scores and, for an incremental scorer, the state of
+        each subset (None when the score came from the cache).
+        """
+        cache, fingerprint = annealing.cache, annealing.fingerprint
+        X, y = annealing.X, annealing.y
+
+        scores = np.empty(len(masks))
+        states = [None] * len(masks)
+        missing = []
+        for k, mask in enumerate(masks):
+            result = None
+            if cache is not None:
+                result = cache.get(mask, None, fingerprint)
+
+            if result is None:
+                missing.append(k)
+            else:
+                scores[k] = result
+
+        remote = cache is not None and os.getpid() != self.pid
+        if remote:
+            self.cache_hits += len(masks) - len(missing)
+            self.cache_misses += len(missing)
+
+        # A batch of n subsets counts as n calls of equal duration
+        if _is_batched(annealing.scorer) and missing:
+            results, duration = _score_batch(annealing.scorer, X, y,
+                                             masks[missing])
+            durations = [duration / len(missing)] * len(missing)
+        elif _is_incremental(annealing.scorer):
+            # Deltas are taken against the subset of the last state,
+            # which is empty when there is none
+            previous = self.ftr_old if self.state_old is not None \
+                else np.zeros(X.shape[1], dtype=bool)
+            results, durations = [], []
+            for k in missing:
+                start = time.perf_counter()
+                result, states[k] = annealing.scorer(
+                    X, y, masks[k], self.state_old,
+                    np.flatnonzero(masks[k] & ~previous),
+                    np.flatnonzero(previous & ~masks[k]))
+                results.append(result)
+                durations.append(time.perf_counter() - start)
+        else:
+            results, durations = [], []
+            for k in missing:
+                result, duration = _Profiler.timed(
+                    annealing.scorer, self.columns(X, masks[k]), y)
+                results.append(result)
+                durations.append(duration)
+
+        self.tracker.record_calls(len(missing))
+        for k, result, duration in zip(missing, results, durations):
+            scores[k] = result
+
+            if annealing.timed:
+                self.timings.append((step, int(masks[k].sum()), duration))
+
+            if cache is not None:
+                cache.put(masks[k], result, fingerprint)
+            if remote:
+                self.cached.append((masks[k].copy(), result))
+
+        return scores, states
+
+    def run(self, annealing, stop):
+        """
+        Run the iterations up to `stop`, or until the budget runs out.
+        """
+        rng, tracker = self.rng, self.tracker
+        n_features = annealing.X.shape[1]
+
+        # Obtain initial array of randomly selected features
+        if self.ftr_old is None:
+            ftr_old = np.array([])
+            while ftr_old.sum() == 0:
+                ftr_old = rng.binomial(1, 0.5, size=n_features).astype('bool')
+            scores, states = self.score(annealing, ftr_old[np.newaxis], 0)
+            self.ftr_old, self.score_old = ftr_old, scores[0]
+            self.state_old = states[0]
+            tracker.update(self.score_old)
+            self.ftr_best, self.score_best = self.ftr_old, self.score_old
+            self.trace[0] = self.score_old
+
+        # Set mutate percentage
+        mutate = 0.05
+        n_mutate = int(np.ceil(n_features * mutate))
+
+        # Iterate through new versions of selected features
+        while self.i < stop and not self.stopped:
+            i = self.i
+
+            # Stop with the best features so far once the budget is spent
+            if tracker.exhausted():
+                self.stopped = True
+                break
+
+            proposals = np.repeat(self.ftr_old[np.newaxis],
+                                  annealing.batch_size, axis=0)
+            for ftr_new in proposals:
+                ftr_mutate = rng.choice(n_features, size=n_mutate,
+                                        replace=False)
+                ftr_new[ftr_mutate] = ~ftr_new[ftr_mutate]
+
+            # Make sure new selected features has at least one feature
+            proposals = proposals[proposals.any(axis=1)]
+            if len(proposals) > 0:
+                # Keep the best proposal, the first one on ties
+                scores, states = self.score(annealing, proposals, i + 1)
+                best = int(np.argmin(scores))
+                ftr_new, score_new = proposals[best], scores[best]
+                state_new = states[best]
+
+                if tracker.update(score_new):
+                    self.ftr_best, self.score_best = ftr_new, score_new
+
+                if score_new < self.score_old:
+                    self.ftr_old = ftr_new
+                    self.score_old = score_new
+                    self.state_old = state_new
+                else:
+                    # Determine probability of acceptance
+                    p_accept = np.exp((-i / self.c) * (
+                        (score_new - self.score_old) / self.score_old))
+                    if rng.random() > p_accept:
+                        pass
+                    else:
+                        self.ftr_old = ftr_new
+                        self.score_old = score_new
+                        self.state_old = state_new
+            else:
+                tracker.update(np.inf)
+
+            self.trace[i + 1] = self.score_old
+            self.i += 1
+
+        return self
+
+    def result(self):
+        """
+        Return the final features, their score and the trace of accepted
+        scores, or the best features seen so far and a truncated trace
+        if the budget ran out.
+        """
+        if self.stopped:
+            return self.ftr_best, self.score_best, self.trace[:self.i + 1]
+
+        return self.ftr_old, self.score_old, self.trace
+
+
+def _split_calls(budget, n_chains):
+    """
+    Split `budget.max_calls` between `n_chains` chains, the first ones
+    getting one call more when it does not divide evenly, or return
+    None for every chain if the number of calls is unlimited.
+    """
+    if budget is None or budget.max_calls is None:
+        return [None] * n_chains
+
+    share, rest = divmod(budget.max_calls, n_chains)
+    return [share + (k < rest) for k in range(n_chains)]
+
+
+def _run_chain(annealing, chain, stop):
+    """
+    Advance `chain` to iteration `stop`; run in worker threads or
+    processes, so the chain is returned rather than only updated.
+    """
+    return chain.run(annealing, stop)
+
+
+def _exchange(chains, i, parity, rng):
+    """
+    Offer every other pair of neighbouring replicas, starting at index
+    `parity`, to swap their current features at iteration `i`.
+
+    A swap is accepted with probability
+    `min(1, exp((i / c_a - i / c_b) * (score_a - score_b) / scale))`,
+    the replica-exchange rule for the acceptance probability of
+    `simulated_annealing`, `scale` being the mean of the two scores
+    since the acceptance uses relative score differences. Replicas
+    stopped by the budget are left alone.
+    """
+    for k in range(parity, len(chains) - 1, 2):
+        a, b = chains[k], chains[k + 1]
+        accept = rng.random()
+
+        if a.stopped or b.stopped:
+            continue
+
+        scale = (abs(a.score_old) + abs(b.score_old)) / 2
+        delta = 0 if scale == 0 else \
+            (i / a.c - i / b.c) * (a.score_old - b.score_old) / scale
+
+        if accept < np.exp(min(delta, 0)):
+            a.ftr_old, b.ftr_old = b.ftr_old, a.ftr_old
+            a.score_old, b.score_old = b.score_old, a.score_old
+            a.state_old, b.state_old = b.state_old, a.state_old
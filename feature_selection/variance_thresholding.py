@@ -1,5 +1,13 @@
+from collections.abc import Iterator
+
 import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from feature_selection._validation import _is_sparse, _open_npy
+
+# Approximate number of values per block of rows reduced at a time
+_BLOCK_SIZE = 2 ** 20
 
 
 def variance_thresholding(data, threshold=0):
@@ -8,8 +16,18 @@ def variance_thresholding(data, threshold=0):
 
     Parameters
     ----------
-    data : numpy ndarray, pandas DataFrame, list
-      A numpy array, a pandas DataFrame or list to select features from
+    data : numpy ndarray, pandas DataFrame, list, path or iterator
+      A numpy array, a pandas DataFrame or list to select features from.
+      Memory maps and paths to `.npy` files (opened as read-only memory
+      maps) are reduced block by block without copying the data.
+      An iterator of row chunks (numpy arrays, lists, DataFrames or
+      objects with a `to_pandas` method such as pyarrow record batches)
+      is streamed, so the whole dataset never has to fit in memory, and
+      gives the same result as the concatenated chunks would. Pandas
+      readers created with `chunksize`, e.g.
+      `pd.read_csv(path, chunksize=100000)`, are such iterators.
+      `scipy.sparse` matrices are reduced from their stored values,
+      without densifying them
     threshold : float, optional
       A variance threshold to filter features for
 
@@ -25,7 +43,16 @@ def variance_thresholding(data, threshold=0):
     >>> X = [[1, 6, 0, 5], [1, 2, 4, 5], [1, 7, 8, 5]]
     >>> variance_thresholding(X)
     array([1, 2])
+    >>> variance_thresholding(iter([X[:2], X[2:]]))
+    array([1, 2])
     """
+    data = _open_npy(data)
+
+    if isinstance(data, Iterator):
+        return _streaming_variance_thresholding(data, threshold)
+
+    if _is_sparse(data):
+        return np.flatnonzero(_variance(_sparse_stats(data)) > threshold)
 
     is_data_list = isinstance(data, list)
     is_data_df = isinstance(data, pd.DataFrame)
@@ -33,31 +60,224 @@ def variance_thresholding(data, threshold=0):
 
     if not (is_data_list or is_data_df or is_data_np_array):
         raise TypeError('Data is of an invalid type.')
-    elif (is_data_np_array or is_data_list) and len(np.array(data).shape) > 2:
+    elif (is_data_np_array or is_data_list) and np.ndim(data) > 2:
         raise ValueError(
             'Data is of an invalid shape. '
             'Please only pass in data of less than two dimensions.'
         )
 
+    # Numerical arrays never need a DataFrame, their variances are
+    # computed straight from the array
+    if is_data_list:
+        data = _numeric_array(data, default=data)
+
+    if isinstance(data, np.ndarray) and _is_numeric_dtype(data.dtype):
+        variances = _variance(_block_stats(data))
+        return np.flatnonzero(variances > threshold)
+
     data_df = data if is_data_df else pd.DataFrame(data)
-    variance_series = data_df.var(axis=0)
+    numeric = _numeric_columns(data_df)
+
+    # Select by column position, so duplicated column names are handled
+    # correctly, and include all the non-numerical columns because only
+    # numerical columns have variances
+    selected = ~numeric
+    selected[numeric] = \
+        _variance(_block_stats(data_df.iloc[:, numeric])) > threshold
+
+    return np.flatnonzero(selected)
+
+
+def _streaming_variance_thresholding(chunks, threshold):
+    """
+    Select features from an iterator of row chunks in a single pass.
+    """
+    columns = None
+    stats = None
+
+    for chunk in chunks:
+        chunk = _as_frame(chunk)
+
+        if columns is None:
+            columns = chunk.shape[1]
+            numeric = _numeric_columns(chunk)
+        elif chunk.shape[1] != columns:
+            raise ValueError('All chunks must have the same number of '
+                             'columns.')
+
+        chunk_stats = _column_stats(chunk.iloc[:, numeric])
+        stats = chunk_stats if stats is None \
+            else _merge_stats(stats, chunk_stats)
+
+    if columns is None:
+        return np.array([], dtype=int)
+
+    # Non-numerical columns are always selected
+    selected = ~numeric
+    selected[numeric] = _variance(stats) > threshold
+
+    return np.flatnonzero(selected)
+
+
+def _as_frame(chunk):
+    """
+    Convert a chunk of rows into a DataFrame.
+    """
+    if isinstance(chunk, pd.DataFrame):
+        return chunk
+
+    if hasattr(chunk, 'to_pandas'):
+        return chunk.to_pandas()
+
+    if isinstance(chunk, (list, np.ndarray)):
+        if np.ndim(chunk) > 2:
+            raise ValueError(
+                'Data is of an invalid shape. '
+                'Please only pass in data of less than two dimensions.'
+            )
+        return pd.DataFrame(chunk)
+
+    raise TypeError('Chunk is of an invalid type.')
+
+
+def _is_numeric_dtype(dtype):
+    """
+    Whether a NumPy dtype holds numbers (including booleans).
+    """
+    return np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_)
+
+
+def _numeric_array(data, default=None):
+    """
+    Convert a list into a numerical NumPy array, or return `default` if
+    it holds anything other than numbers.
+    """
+    try:
+        array = np.asarray(data)
+    except ValueError:
+        return default
+
+    return array if _is_numeric_dtype(array.dtype) else default
+
 
-    # Get all non-numerical columns because .var only keeps numerical
-    # columns and their variances
-    non_num_columns = data_df.columns.difference(variance_series.index)
+def _numeric_columns(data_df):
+    """
+    Return a boolean mask of the numerical columns of a DataFrame.
+    """
+    return np.array([is_numeric_dtype(dtype) for dtype in data_df.dtypes],
+                    dtype=bool)
+
+
+def _block_stats(data):
+    """
+    Compute the column statistics of a 2d array or DataFrame one block
+    of rows at a time, so temporaries stay small and memory maps are
+    only read through views.
+    """
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+
+    step = max(1, _BLOCK_SIZE // max(1, data.shape[1]))
+    stats = _column_stats(data[:0] if isinstance(data, np.ndarray)
+                          else data.iloc[:0])
+
+    for start in range(0, data.shape[0], step):
+        block = data[start:start + step] if isinstance(data, np.ndarray) \
+            else data.iloc[start:start + step]
+        stats = _merge_stats(stats, _column_stats(block))
+
+    return stats
+
+
+def _sparse_stats(data):
+    """
+    Compute the column statistics of a `scipy.sparse` matrix from its
+    stored values, ignoring NaN, in time and memory proportional to the
+    number of stored values. The squared deviations of the implicit
+    zeros are added as `n_zeros * mean ** 2`.
+    """
+    coo = data.tocoo(copy=True)
+    coo.sum_duplicates()
+    n_samples, n_features = coo.shape
+
+    values = coo.data.astype(float)
+    present = ~np.isnan(values)
+    columns, values = coo.col[present], values[present]
+
+    stored = np.bincount(columns, minlength=n_features)
+    count = n_samples - np.bincount(coo.col[~present], minlength=n_features)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(columns, values, minlength=n_features) / count
+
+    deviation = values - mean[columns]
+    m2 = np.bincount(columns, deviation * deviation, minlength=n_features) \
+        + (count - stored) * np.nan_to_num(mean) ** 2
+
+    # Implicit zeros take part in the minimum and maximum
+    low = np.where(stored < count, 0.0, np.inf)
+    high = np.where(stored < count, 0.0, -np.inf)
+    np.fmin.at(low, columns, values)
+    np.fmax.at(high, columns, values)
+
+    return count, mean, m2, low, high
 
-    # Get all numerical columns with variances above the threshold
-    selected_num_columns = variance_series[
-        variance_series > threshold
-    ].index
 
-    # Include all the non-numerical columns
-    all_selected_columns = selected_num_columns.append(non_num_columns)
+def _column_stats(values):
+    """
+    Compute the per-column count, mean, sum of squared deviations (M2),
+    minimum and maximum of a 2d block of numbers, ignoring NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    count = values.shape[0] - missing.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(missing, 0, values).sum(axis=0) / count
+
+    deviation = np.where(missing, 0, values - mean)
+    m2 = (deviation * deviation).sum(axis=0)
+
+    if values.shape[0] == 0:
+        low = high = np.full(values.shape[1], np.nan)
+    else:
+        low = np.fmin.reduce(values, axis=0)
+        high = np.fmax.reduce(values, axis=0)
+
+    return count, mean, m2, low, high
+
+
+def _merge_stats(a, b):
+    """
+    Combine the statistics of two blocks of rows (Chan et al.).
+    """
+    count_a, mean_a, m2_a, low_a, high_a = a
+    count_b, mean_b, m2_b, low_b, high_b = b
+    count = count_a + count_b
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = np.nan_to_num(mean_b - mean_a)
+        mean = np.where(count_b == 0, mean_a,
+                        np.where(count_a == 0, mean_b,
+                                 mean_a + delta * count_b / count))
+        m2 = m2_a + m2_b + np.where(
+            count == 0, 0, delta * delta * count_a * count_b / count)
+
+    return count, mean, m2, np.fmin(low_a, low_b), np.fmax(high_a, high_b)
+
+
+def _variance(stats):
+    """
+    Sample variance (ddof=1) of every column from its statistics.
+
+    Columns with fewer than two values have a NaN variance, and constant
+    columns have a variance of exactly 0 rather than a rounding error.
+    """
+    count, _, m2, low, high = stats
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.where(count > 1, m2 / (count - 1), np.nan)
 
-    # Transform the selected columns into column indexes
-    selected_column_indexes = np.array(list(map(
-        lambda x: data_df.columns.get_loc(x),
-        all_selected_columns
-    )))
+    variance[(count > 1) & (low == high)] = 0
 
-    return np.sort(selected_column_indexes)
+    return variance
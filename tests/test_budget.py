@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression
+
+from feature_selection import Budget, ScoreCache, forward_selection, \
+    recursive_feature_elimination, simulated_annealing
+
+
+def scorer(X, y):
+    """
+    Sample custom scorer that fits a model and returns
+    an appropriate score for the feature selection problem.
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Test samples
+    y : array-like of shape (n_samples,) or (n_samples, n_outputs)
+        True values for X, used for training
+    Returns
+    -------
+    Error of scorer
+    """
+    lr = LinearRegression().fit(X, y)
+    return 1 - lr.score(X, y)
+
+
+def rfe_scorer(X, y):
+    """
+    Sample custom scorer returning the feature column with the lowest
+    weight.
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return X.columns[model.coef_.argmin()]
+
+
+class Counter:
+    """
+    Wrap a scorer to count its calls.
+    """
+
+    def __init__(self, scorer):
+        self.calls = 0
+
+        def counted(X, y):
+            self.calls += 1
+            return scorer(X, y)
+
+        self.scorer = counted
+
+
+def test_budget_parameters():
+    """
+    Test that limits must be positive
+    """
+    assert 'max_calls=5' in repr(Budget(max_calls=5))
+
+    for limit in ['max_time', 'max_calls', 'patience']:
+        with pytest.raises(ValueError):
+            Budget(**{limit: 0})
+
+
+def test_forward_selection_budget():
+    """
+    Test that forward selection stops at the budget with the features
+    of the completed steps
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    expected = forward_selection(scorer, X, y, 4, 4)
+
+    # Two full steps cost 10 + 9 calls; the third one cannot finish
+    for n_jobs in [None, 2]:
+        counter = Counter(scorer)
+        results = forward_selection(counter.scorer, X, y, 4, 4,
+                                    n_jobs=n_jobs,
+                                    budget=Budget(max_calls=25))
+        assert results == expected[:2]
+        assert counter.calls <= 25
+
+    # Cached scores do not count towards the budget
+    cache = ScoreCache()
+    forward_selection(scorer, X, y, 4, 4, cache=cache)
+    results = forward_selection(scorer, X, y, 4, 4, cache=cache,
+                                budget=Budget(max_calls=1))
+    assert results == expected
+
+    results = forward_selection('linear', X, y, 4, 4,
+                                budget=Budget(max_time=1e-9))
+    assert results == []
+
+    # Each vectorized step of the built-in scorer counts as one call
+    results = forward_selection('linear', X, y, 4, 4,
+                                budget=Budget(max_calls=2))
+    assert results == forward_selection('linear', X, y, 4, 4)[:2]
+
+
+def test_rfe_budget():
+    """
+    Test that recursive feature elimination stops at the budget with
+    the remaining features
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    counter = Counter(rfe_scorer)
+
+    features = recursive_feature_elimination(
+        counter.scorer, X, y, 4, budget=Budget(max_calls=3, patience=1))
+    assert len(features) == 7
+    assert counter.calls == 3
+
+
+def test_sa_budget():
+    """
+    Test that simulated annealing stops at the budget with the best
+    features seen so far
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    counter = Counter(scorer)
+
+    features, traces = simulated_annealing(
+        counter.scorer, X, y, iterations=1000, random_state=0,
+        budget=Budget(max_calls=30), return_traces=True, bools=True)
+    assert counter.calls == 30
+    assert len(traces[0]) < 1001
+    assert scorer(X[:, features], y) == pytest.approx(
+        np.min(traces[0]))
+
+    # The calls are shared by the chains or replicas of a run
+    for options in [{'n_chains': 4}, {'temperatures': [1, 2, 4]}]:
+        counter = Counter(scorer)
+        simulated_annealing(counter.scorer, X, y, iterations=1000,
+                            random_state=0, budget=Budget(max_calls=30),
+                            **options)
+        assert counter.calls == 30
+
+    features, traces = simulated_annealing(
+        scorer, X, y, iterations=1000, random_state=0,
+        budget=Budget(patience=20), return_traces=True)
+    assert len(traces[0]) < 1001
+
+    start = time.monotonic()
+    simulated_annealing(scorer, X, y, iterations=100000, n_chains=2,
+                        budget=Budget(max_time=0.5))
+    assert time.monotonic() - start < 5
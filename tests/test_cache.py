@@ -0,0 +1,234 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_friedman1
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+
+from feature_selection import ScoreCache, forward_selection, \
+    recursive_feature_elimination, simulated_annealing
+from feature_selection.scoring import cv_scorer
+
+
+def scorer(X, y):
+    """
+    Sample custom scorer that fits a model and returns
+    an appropriate score for the feature selection problem.
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Test samples
+    y : array-like of shape (n_samples,) or (n_samples, n_outputs)
+        True values for X, used for training
+    Returns
+    -------
+    Error of scorer
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return 1 - model.score(X, y)
+
+
+def rfe_scorer(X, y):
+    """
+    Sample custom scorer returning the feature column with the lowest
+    weight.
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return X.columns[model.coef_.argmin()]
+
+
+def test_score_cache():
+    """
+    Test lookups, counters and least-recently-used eviction
+    """
+    cache = ScoreCache(maxsize=2)
+    a = np.array([True, False, True])
+    b = np.array([False, True, True])
+    c = np.array([True, True, True])
+
+    assert cache.get(a) is None
+    cache.put(a, 0.1)
+    cache.put(b, 0.2)
+    assert cache.get(a) == 0.1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # `b` is the least recently used subset and gets evicted
+    cache.put(c, 0.3)
+    assert len(cache) == 2
+    assert cache.get(b) is None
+    assert cache.get(a) == 0.1
+    assert cache.get(c) == 0.3
+
+    # Lists and boolean arrays give the same key
+    assert cache.key([True, False, True]) == cache.key(a)
+
+    # The cache survives pickling for process pools
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get(a) == 0.1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    with pytest.raises(ValueError):
+        ScoreCache(maxsize=0)
+
+
+def test_sa_cache():
+    """
+    Test that a cache gives the same result as scoring every subset
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    cache = ScoreCache(maxsize=None)
+
+    expected = simulated_annealing(scorer, X, y, iterations=200,
+                                   random_state=3)
+    features = simulated_annealing(scorer, X, y, iterations=200,
+                                   random_state=3, cache=cache)
+
+    assert np.array_equal(features, expected)
+    assert cache.hits > 0
+    assert cache.hits + cache.misses <= 201
+    assert len(cache) == cache.misses
+
+    # Chains run in worker processes fill the caller's cache
+    serial = ScoreCache(maxsize=None)
+    expected = simulated_annealing(scorer, X, y, iterations=200,
+                                   random_state=3, n_chains=2, cache=serial)
+    for executor in ['process', 'thread']:
+        cache = ScoreCache(maxsize=None)
+        features = simulated_annealing(scorer, X, y, iterations=200,
+                                       random_state=3, n_chains=2, n_jobs=2,
+                                       executor=executor, cache=cache)
+        assert np.array_equal(features, expected)
+        assert cache.hits + cache.misses == serial.hits + serial.misses
+        assert len(cache) == len(serial)
+
+
+def test_score_cache_fingerprint():
+    """
+    Test that scores are kept apart by dataset and scorer
+    """
+    X, y = make_friedman1(n_samples=50, n_features=5, random_state=10)
+    fingerprint = ScoreCache.fingerprint(X, y, scorer)
+
+    assert ScoreCache.fingerprint(X.copy(), y, scorer) == fingerprint
+    assert ScoreCache.fingerprint(X + 1, y, scorer) != fingerprint
+    assert ScoreCache.fingerprint(X, y, rfe_scorer) != fingerprint
+
+    cache = ScoreCache()
+    mask = np.array([True, False, True, False, True])
+    cache.put(mask, 0.5, fingerprint)
+    assert cache.get(mask) is None
+    assert cache.get(mask, fingerprint=fingerprint) == 0.5
+
+
+def test_score_cache_sparse_fingerprint():
+    """
+    Test that sparse matrices are fingerprinted by value, whatever their
+    format
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    X, y = make_friedman1(n_samples=50, n_features=5, random_state=10)
+    X[X < 0.5] = 0
+    fingerprint = ScoreCache.fingerprint(sparse.csr_matrix(X), y, scorer)
+
+    assert ScoreCache.fingerprint(sparse.csc_matrix(X), y,
+                                  scorer) == fingerprint
+    assert ScoreCache.fingerprint(sparse.csr_matrix(X + 1), y,
+                                  scorer) != fingerprint
+
+
+def test_score_cache_max_bytes():
+    """
+    Test eviction by approximate size in bytes
+    """
+    cache = ScoreCache(maxsize=None, max_bytes=600)
+
+    for n in range(100):
+        cache.put(np.arange(16) == n % 16, np.zeros(n % 4 + 1), bytes([n]))
+        assert cache.nbytes <= 600
+
+    assert 0 < len(cache) < 100
+
+    with pytest.raises(ValueError):
+        ScoreCache(max_bytes=0)
+
+
+def test_score_cache_persistence(tmp_path):
+    """
+    Test that scores persisted to disk are reused by a new cache
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    path = str(tmp_path / 'scores.sqlite')
+
+    cache = ScoreCache(path=path, scorer_key='linear-v1')
+    expected = forward_selection(scorer, X, y, 3, 6, cache=cache)
+    assert cache.hits == 0
+
+    cache = ScoreCache(path=path, scorer_key='linear-v1')
+    assert len(cache) == 0
+    assert forward_selection(scorer, X, y, 3, 6, cache=cache) == expected
+    assert cache.misses == 0
+    assert cache.hits > 0
+
+    copy = pickle.loads(pickle.dumps(cache))
+    copy.clear()
+    assert forward_selection(scorer, X, y, 3, 6, cache=copy) == expected
+    assert copy.misses == 0
+
+    # Scores of another version of the scorer are not reused
+    cache = ScoreCache(path=path, scorer_key='linear-v2')
+    forward_selection(scorer, X, y, 3, 6, cache=cache)
+    assert cache.hits == 0
+
+    # Persisted scores must say which scorer they belong to
+    with pytest.raises(ValueError):
+        ScoreCache(path=path)
+
+
+def test_score_cache_closures():
+    """
+    Test that scorers made by the same factory, which share a qualified
+    name, do not share scores
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    linear = cv_scorer(LinearRegression())
+    dummy = cv_scorer(DummyRegressor())
+    expected = forward_selection(dummy, X, y, 1, 4)
+
+    cache = ScoreCache()
+    assert forward_selection(linear, X, y, 1, 4, cache=cache) != expected
+    assert forward_selection(dummy, X, y, 1, 4, cache=cache) == expected
+    assert cache.hits == 0
+
+    assert ScoreCache.fingerprint(X, y, linear) == \
+        ScoreCache.fingerprint(X, y, linear)
+    assert ScoreCache.fingerprint(X, y, linear) != \
+        ScoreCache.fingerprint(X, y, dummy)
+
+
+def test_selectors_share_cache():
+    """
+    Test that every selector reuses the scores of earlier runs
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    cache = ScoreCache(maxsize=None)
+
+    expected = forward_selection(scorer, X, y, 3, 6)
+    assert forward_selection(scorer, X, y, 3, 6, cache=cache) == expected
+    misses = cache.misses
+    assert forward_selection(scorer, X, y, 3, 6, n_jobs=2,
+                             cache=cache) == expected
+    assert cache.misses == misses
+
+    expected = recursive_feature_elimination(rfe_scorer, X, y, 4)
+    assert recursive_feature_elimination(rfe_scorer, X, y, 4,
+                                         cache=cache) == expected
+    misses = cache.misses
+    assert recursive_feature_elimination(rfe_scorer, X, y, 4,
+                                         cache=cache) == expected
+    assert cache.misses == misses
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_selection import correlation_thresholding
+
+
+def reference_correlation_thresholding(X, threshold):
+    """
+    Greedy selection on the full correlation matrix
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlations = np.nan_to_num(np.corrcoef(X.T))
+
+    kept = []
+    for j in range(X.shape[1]):
+        if all(abs(correlations[j, k]) <= threshold for k in kept):
+            kept.append(j)
+
+    return np.array(kept)
+
+
+rng = np.random.default_rng(0)
+base = rng.standard_normal((300, 120))
+X = np.column_stack([base, base[:, :40] * 2 + 0.01 * rng.standard_normal(
+    (300, 40)), np.ones(300), -base[:, 5]])
+
+
+def test_correlation_thresholding():
+    """
+    Test the blocked computation against the full correlation matrix
+    """
+    expected = reference_correlation_thresholding(X, 0.9)
+    assert len(expected) == 121
+
+    for block_size in [1, 7, 64, 1000]:
+        for dtype in [np.float64, np.float32]:
+            for n_jobs in [None, 3]:
+                kept = correlation_thresholding(X, 0.9, block_size, dtype,
+                                                n_jobs)
+                assert np.array_equal(kept, expected)
+
+    data = [[1, 2, 0, 5], [2, 4, 4, 3], [3, 6, 1, 1], [4, 8, 7, 0]]
+    assert np.array_equal(correlation_thresholding(data, 0.95), [0, 2])
+    assert np.array_equal(correlation_thresholding(data, 1), [0, 1, 2, 3])
+
+
+def test_correlation_thresholding_inputs(tmp_path):
+    """
+    Test that every input type gives the same result
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    expected = correlation_thresholding(X, 0.9, 50)
+    np.save(tmp_path / 'X.npy', X)
+
+    for data in [pd.DataFrame(X), sparse.csr_matrix(X), tmp_path / 'X.npy']:
+        assert np.array_equal(correlation_thresholding(data, 0.9, 50),
+                              expected)
+
+    with pytest.raises(TypeError):
+        correlation_thresholding('data')
+
+    with pytest.raises(ValueError):
+        correlation_thresholding(X, 1.5)
+
+    with pytest.raises(ValueError):
+        correlation_thresholding(X, 0.9, 0)
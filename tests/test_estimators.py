@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import make_pipeline
+
+from feature_selection import forward_selection, \
+    recursive_feature_elimination, simulated_annealing, \
+    variance_thresholding
+from feature_selection.estimators import AnnealingSelector, \
+    ForwardSelector, RecursiveEliminator, VarianceSelector
+from feature_selection.scoring import cv_scorer
+
+calls = []
+
+
+def scorer(X, y):
+    """
+    Error of a linear regression on X, counting the calls
+    """
+    calls.append(X.shape[1])
+    model = LinearRegression()
+    model.fit(X, y)
+    return 1 - model.score(X, y)
+
+
+def weakest(X, y):
+    """
+    Label of the feature with the smallest coefficient
+    """
+    model = LinearRegression().fit(X, y)
+    return X.columns[np.abs(model.coef_).argmin()]
+
+
+@pytest.fixture(autouse=True)
+def clear_fitted():
+    ForwardSelector.clear_fitted()
+    calls.clear()
+
+
+def test_selectors():
+    """
+    Test that the estimators select the same features as the functions
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=0)
+    X[:, 7] = 0
+
+    selector = ForwardSelector(scorer, max_features=6).fit(X, y)
+    expected = forward_selection(scorer, X, y, max_features=6)
+    assert np.array_equal(selector.selected_, expected)
+    assert np.array_equal(selector.get_support(indices=True),
+                          np.sort(expected))
+    assert np.array_equal(selector.transform(X), X[:, np.sort(expected)])
+
+    selector = AnnealingSelector(scorer, random_state=0).fit(X, y)
+    expected = simulated_annealing(scorer, X, y, random_state=0)
+    assert np.array_equal(selector.selected_, expected)
+
+    selector = VarianceSelector(0.01).fit(X)
+    assert np.array_equal(selector.selected_, variance_thresholding(X, 0.01))
+
+    X = pd.DataFrame(X, columns=[f'x{i}' for i in range(10)])
+    selector = RecursiveEliminator(weakest, 4).fit(X, y)
+    expected = recursive_feature_elimination(weakest, X, y, 4)
+    assert list(selector.get_feature_names_out()) == sorted(expected)
+    assert list(selector.transform(X).columns) == sorted(expected)
+
+
+def test_reuse():
+    """
+    Test that fitting again on the same data with the same parameters
+    does not run the selection again
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=0)
+
+    selector = ForwardSelector(scorer, max_features=6).fit(X, y)
+    n_calls = len(calls)
+    assert not selector.reused_
+
+    again = clone(selector).fit(X.copy(), y)
+    assert again.reused_ and len(calls) == n_calls
+    assert np.array_equal(again.selected_, selector.selected_)
+
+    # Other parameters or data run it again
+    assert not clone(selector).set_params(max_features=3).fit(X, y).reused_
+    assert not clone(selector).fit(X[:100], y[:100]).reused_
+
+    # Scorers made by the same factory are told apart
+    first = ForwardSelector(cv_scorer(LinearRegression()), max_features=3)
+    second = ForwardSelector(cv_scorer(Ridge(alpha=100)), max_features=3)
+    first.fit(X, y)
+    assert not second.fit(X, y).reused_
+    assert clone(first).fit(X, y).reused_
+
+    # So do random selections
+    AnnealingSelector(scorer, iterations=5).fit(X, y)
+    assert not AnnealingSelector(scorer, iterations=5).fit(X, y).reused_
+
+    # A grid search over a later step selects once per fold and refit
+    search = GridSearchCV(
+        make_pipeline(ForwardSelector(scorer, max_features=6), Ridge()),
+        {'ridge__alpha': [0.1, 1, 10]}, cv=3)
+    search.fit(X, y)
+    n_calls = len(calls)
+    search.fit(X, y)
+    assert len(calls) == n_calls
+
+
+def test_transform_views():
+    """
+    Test that contiguous selections are returned as views of X
+    """
+    X = np.arange(40.).reshape(4, 10)
+    X[:, :2] = 0
+    X[:, 5] = 0
+
+    selector = VarianceSelector().fit(X)
+    assert np.array_equal(selector.transform(X), X[:, [2, 3, 4, 6, 7, 8, 9]])
+
+    X = X[:, 2:5]
+    selector = VarianceSelector().fit(X)
+    assert selector.transform(X) is X
+
+    X = np.hstack([np.zeros((4, 1)), X])
+    selector = VarianceSelector().fit(X)
+    assert np.shares_memory(selector.transform(X), X)
+
+    with pytest.raises(ValueError):
+        selector.transform(X[:, 1:])
+
+
+def test_input_validation():
+    """
+    Test that X is validated like in scikit-learn estimators
+    """
+    X = np.arange(12.).reshape(4, 3) ** 2
+
+    selector = VarianceSelector().fit(X.tolist())
+    assert np.array_equal(selector.transform(X.tolist()), X)
+
+    for data in [X[0], np.empty((0, 3)), np.where(X > 50, np.nan, X),
+                 X + 1j, np.array([['a', 'b']] * 4, dtype=object)]:
+        with pytest.raises(ValueError):
+            VarianceSelector().fit(data)
+
+    with pytest.raises(ValueError):
+        selector.transform(X[0])
+
+    with pytest.raises(ValueError, match='expecting 3 features'):
+        selector.transform(X[:, :2])
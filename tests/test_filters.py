@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification, make_friedman1
+from sklearn.feature_selection import chi2, f_classif, f_regression
+
+from feature_selection import select_k_best
+from feature_selection import filters
+from feature_selection.filters import univariate_scores
+
+X, y = make_friedman1(n_samples=200, n_features=20, random_state=0)
+X_class, y_class = make_classification(n_samples=300, n_features=15,
+                                       random_state=0)
+
+
+def test_univariate_scores():
+    """
+    Test the statistics against scikit-learn
+    """
+    assert np.allclose(univariate_scores(X, y), f_regression(X, y)[0])
+    assert np.allclose(univariate_scores(X, y, 'pearson'),
+                       np.abs([np.corrcoef(x, y)[0, 1] for x in X.T]))
+    assert np.allclose(univariate_scores(X_class, y_class, 'f_classif'),
+                       f_classif(X_class, y_class)[0])
+    counts = np.abs(X_class)
+    assert np.allclose(univariate_scores(counts, y_class, 'chi2'),
+                       chi2(counts, y_class)[0])
+
+    # Mutual information of binned features against classes
+    informative = univariate_scores(X_class, y_class, 'mutual_info')
+    assert (informative >= 0).all()
+    assert informative.argmax() == \
+        univariate_scores(X_class, y_class, 'f_classif').argmax()
+
+    # Constant features score 0
+    constant = X.copy()
+    constant[:, 5] = 3
+    for method in ['pearson', 'f_regression', 'mutual_info']:
+        assert univariate_scores(constant, y, method)[5] == 0
+
+    with pytest.raises(ValueError):
+        univariate_scores(-counts, y_class, 'chi2')
+
+    with pytest.raises(ValueError):
+        univariate_scores(X, y, 'spearman')
+
+    with pytest.raises(ValueError):
+        univariate_scores(X, y[:10])
+
+
+def test_select_k_best():
+    """
+    Test that the top features are returned in increasing order
+    """
+    assert np.array_equal(select_k_best(X, y, 4), [0, 1, 3, 4])
+    assert np.array_equal(select_k_best(X, y, 100), np.arange(20))
+
+    # Ties go to the leftmost feature
+    duplicated = np.column_stack([X[:, 3], X[:, 3], X[:, 0]])
+    assert np.array_equal(select_k_best(duplicated, y, 1), [0])
+
+    with pytest.raises(ValueError):
+        select_k_best(X, y, 0)
+
+
+def test_filter_inputs(tmp_path, monkeypatch):
+    """
+    Test that every input type gives the same scores, a block of columns
+    at a time
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    monkeypatch.setattr(filters, '_BLOCK_SIZE', 1000)
+    np.save(tmp_path / 'X.npy', X)
+
+    for method in ['f_regression', 'mutual_info']:
+        expected = univariate_scores(X, y, method)
+        for data in [pd.DataFrame(X), sparse.csr_matrix(X),
+                     tmp_path / 'X.npy']:
+            assert np.allclose(univariate_scores(data, y, method), expected)
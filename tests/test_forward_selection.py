@@ -1,9 +1,16 @@
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 from sklearn.datasets import make_friedman1
 from sklearn.linear_model import LinearRegression
 
-from feature_selection import forward_selection
+from feature_selection import Budget, ScoreCache, forward_selection
+from feature_selection._parallel import _executor_scope
+from feature_selection.forward_selection import _Scoring, \
+    _floating_max_calls
 
 
 def scorer(X, y):
@@ -24,6 +31,13 @@ def scorer(X, y):
     return 1 - lr.score(X, y)
 
 
+def n_samples(scoring):
+    '''
+    Number of samples of the data of a run, read in a worker process
+    '''
+    return scoring.X.shape[0]
+
+
 def test_forward_selection():
     """
     This test creates a dataset that has 5 features that
@@ -123,3 +137,210 @@ def test_forward_selection_datasets():
     # X and y must have consistent number of samples
     with pytest.raises(ValueError):
         forward_selection(scorer, two_d_array, np.array([0, 1, 2]), 1)
+
+
+def test_forward_selection_parallel():
+    '''
+    Tests that scoring candidates in parallel selects the same features
+    as the serial path
+    '''
+    data, target = make_friedman1(
+        n_samples=200, n_features=10, random_state=10)
+    expected = forward_selection(scorer, data, target, 3, 6)
+
+    for executor in ['thread', 'process']:
+        results = forward_selection(scorer, data, target, 3, 6,
+                                    n_jobs=2, executor=executor)
+        assert results == expected
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = forward_selection(scorer, data, target, 3, 6,
+                                    executor=pool)
+    assert results == expected
+
+    # Ties are broken towards the lowest column index
+    tied = np.hstack([data[:, [3]], data[:, [3]], data[:, [3]]])
+    results = forward_selection(scorer, tied, target, 1, 1, n_jobs=3)
+    assert results == [0]
+
+    # Process pools get the data once per worker, tasks only a key
+    scoring = _Scoring(scorer, data, target)
+    with _executor_scope(2, 'process', scoring) as pool:
+        assert len(pickle.dumps(scoring)) < 200
+        assert pool.submit(n_samples, scoring).result() == 200
+    assert len(pickle.dumps(scoring)) > data.nbytes
+
+    with pytest.raises(ValueError):
+        forward_selection(scorer, data, target, 3, 6, n_jobs=0)
+
+    with pytest.raises(ValueError):
+        forward_selection(scorer, data, target, 3, 6, n_jobs=2,
+                          executor='gpu')
+
+
+def test_forward_selection_linear():
+    '''
+    Tests that the built-in linear scorer selects the same features as
+    a LinearRegression scorer
+    '''
+    data, target = make_friedman1(
+        n_samples=200, n_features=15, random_state=0)
+
+    for min_features, max_features in [(1, 1), (4, 4), (3, 6), (2, 15)]:
+        expected = forward_selection(scorer, data, target,
+                                     min_features, max_features)
+        results = forward_selection('linear', data, target,
+                                    min_features, max_features)
+        assert results == expected
+
+    # Collinear columns never improve the fit
+    collinear = np.hstack([data[:, :5], 2 * data[:, [3]]])
+    results = forward_selection('linear', collinear, target, 6, 6)
+    assert results[-1] == 5
+
+    with pytest.raises(TypeError):
+        forward_selection('quadratic', data, target)
+
+
+def test_forward_selection_memmap(tmp_path):
+    '''
+    Tests memory-mapped inputs and paths to .npy files
+    '''
+    data, target = make_friedman1(
+        n_samples=200, n_features=10, random_state=10)
+    expected = forward_selection(scorer, data, target, 3, 6)
+    np.save(tmp_path / 'X.npy', data)
+    np.save(tmp_path / 'y.npy', target)
+
+    results = forward_selection(scorer, str(tmp_path / 'X.npy'),
+                                tmp_path / 'y.npy', 3, 6)
+    assert results == expected
+
+    memmap = np.load(tmp_path / 'X.npy', mmap_mode='r')
+    assert forward_selection(scorer, memmap, target, 3, 6) == expected
+
+
+def test_forward_selection_checkpoint(tmp_path):
+    '''
+    Tests resuming an interrupted run from its checkpoint
+    '''
+    data, target = make_friedman1(
+        n_samples=200, n_features=10, random_state=10)
+    expected = forward_selection(scorer, data, target, 3, 6)
+    path = tmp_path / 'checkpoint.json'
+    calls = []
+
+    def interrupted_scorer(X, y):
+        calls.append(X.shape[1])
+        if len(calls) == 25:
+            raise KeyboardInterrupt
+        return scorer(X, y)
+
+    with pytest.raises(KeyboardInterrupt):
+        forward_selection(interrupted_scorer, data, target, 3, 6,
+                          checkpoint=path)
+
+    # Only the third step, with two features selected, is redone
+    calls.clear()
+    results = forward_selection(interrupted_scorer, data, target, 3, 6,
+                                checkpoint=path, resume_from=path)
+    assert results == expected
+    assert calls[0] == 3
+
+    for scorer_ in [scorer, 'linear']:
+        assert forward_selection(scorer_, data, target, 3, 6,
+                                 resume_from=path) == expected
+
+    # The checkpoint must match the data
+    with pytest.raises(ValueError):
+        forward_selection(scorer, data[:, :5], target, 3, 6,
+                          resume_from=path)
+
+
+def test_forward_selection_sparse():
+    """
+    Test that sparse matrices give the same result as dense arrays, and
+    that the scorer is given sparse columns
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    data, target = make_friedman1(
+        n_samples=200, n_features=10, random_state=10)
+    expected = forward_selection(scorer, data, target, 3, 6)
+
+    def sparse_scorer(X, y):
+        assert sparse.issparse(X)
+        return scorer(X, y)
+
+    for n_jobs in [None, 2]:
+        results = forward_selection(sparse_scorer, sparse.csr_matrix(data),
+                                    target, 3, 6, n_jobs=n_jobs)
+        assert results == expected
+
+    with pytest.raises(TypeError):
+        forward_selection('linear', sparse.csr_matrix(data), target, 3, 6)
+
+
+def test_forward_selection_floating(monkeypatch):
+    '''
+    Tests that floating selection removes a feature that only looked
+    good while the features explaining it were missing
+    '''
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(2, 300))
+    data = np.column_stack([a, b, a + b + 0.6 * rng.normal(size=300),
+                            rng.normal(size=(300, 5))])
+    target = a + b + 0.1 * rng.normal(size=300)
+
+    assert forward_selection(scorer, data, target, 1, 4) == [2, 0, 1]
+    expected = forward_selection(scorer, data, target, 1, 4, floating=True)
+    assert expected == [0, 1]
+
+    for n_jobs in [2, None]:
+        calls = []
+
+        def counting_scorer(X, y):
+            calls.append(X.shape[1])
+            return scorer(X, y)
+
+        results = forward_selection(counting_scorer, data, target, 1, 4,
+                                    n_jobs=n_jobs, floating=True)
+        assert results == expected
+
+    # Every subset is scored once, whether it is reached by adding or
+    # removing a feature
+    n_calls = len(calls)
+    assert len(set(calls)) > 1
+    cache = ScoreCache()
+    forward_selection(counting_scorer, data, target, 1, 4, cache=cache,
+                      floating=True)
+    assert len(calls) == 2 * n_calls and cache.hits > 0
+
+    # The number of scorer calls is capped exactly
+    for max_calls in [5, 15, 20]:
+        calls.clear()
+        forward_selection(counting_scorer, data, target, 1, 4,
+                          budget=Budget(max_calls=max_calls), floating=True)
+        assert len(calls) == max_calls
+
+    # Even without a budget
+    assert _floating_max_calls(8, 4) == 4 * (8 + 7 + 6 + 5)
+    monkeypatch.setattr(sys.modules[_Scoring.__module__],
+                        '_floating_max_calls', lambda *args: 12)
+    calls.clear()
+    forward_selection(counting_scorer, data, target, 1, 4, floating=True)
+    assert len(calls) == 12
+    monkeypatch.undo()
+
+    # Subsets scored by worker processes are cached in this process
+    cache = ScoreCache()
+    results = forward_selection(scorer, data, target, 1, 4, n_jobs=2,
+                                executor='process', cache=cache,
+                                floating=True)
+    assert results == expected and len(cache) == n_calls
+    misses = cache.misses
+    forward_selection(scorer, data, target, 1, 4, n_jobs=2,
+                      executor='process', cache=cache, floating=True)
+    assert cache.misses == misses
+
+    with pytest.raises(TypeError):
+        forward_selection('linear', data, target, floating=True)
@@ -0,0 +1,180 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression
+
+from feature_selection import SelectionPipeline, correlation_thresholding, \
+    forward_selection, recursive_feature_elimination, select_k_best, \
+    simulated_annealing, variance_thresholding
+
+
+def scorer(X, y):
+    """
+    Error of a linear regression on X
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return 1 - model.score(X, y)
+
+
+def weakest(X, y):
+    """
+    Label of the feature with the smallest coefficient
+    """
+    model = LinearRegression().fit(X, y)
+    return X.columns[np.abs(model.coef_).argmin()]
+
+
+def test_pipeline():
+    """
+    Test that the pipeline gives the same features as chaining the
+    selectors by hand
+    """
+    X, y = make_friedman1(n_samples=200, n_features=40, random_state=0)
+    X[:, 5] = 1
+    X[:, 7] = 2 * X[:, 0]
+
+    pipeline = SelectionPipeline() \
+        .add('variance', variance_thresholding, threshold=0.01) \
+        .add('correlation', correlation_thresholding, threshold=0.95) \
+        .add('filter', select_k_best, k=10) \
+        .add('forward', forward_selection, scorer=scorer, max_features=6)
+    selected = pipeline.fit(X, y).selected_
+
+    kept = variance_thresholding(X, threshold=0.01)
+    kept = kept[correlation_thresholding(X[:, kept], threshold=0.95)]
+    kept = kept[select_k_best(X[:, kept], y, k=10)]
+    kept = kept[forward_selection(scorer, X[:, kept], y, max_features=6)]
+    assert np.array_equal(selected, kept)
+    assert 5 not in selected and 7 not in selected
+    assert np.array_equal(pipeline.transform(X), X[:, kept])
+
+    report = pipeline.report()
+    assert list(report['stage']) == ['variance', 'correlation', 'filter',
+                                     'forward']
+    assert list(report['n_features_in']) == [40, 39, 38, 10]
+    assert list(report['n_features_out']) == [39, 38, 10, len(kept)]
+    assert (report['seconds'] >= 0).all()
+
+
+def test_pipeline_dataframe():
+    """
+    Test that column labels and boolean masks are mapped back to the
+    original columns
+    """
+    X, y = make_friedman1(n_samples=200, n_features=20, random_state=0)
+    X = pd.DataFrame(X, columns=[f'x{i}' for i in range(20)])
+
+    pipeline = SelectionPipeline([
+        ('filter', select_k_best, {'k': 10}),
+        ('rfe', recursive_feature_elimination,
+         {'scorer': weakest, 'n_features_to_select': 5}),
+        ('annealing', simulated_annealing,
+         {'scorer': scorer, 'bools': True, 'random_state': 0})])
+    selected = pipeline.fit(X, y).selected_
+
+    kept = select_k_best(X, y, k=10)
+    labels = recursive_feature_elimination(weakest, X.iloc[:, kept], y, 5)
+    kept = X.columns.get_indexer(labels)
+    mask = simulated_annealing(scorer, X.iloc[:, kept], y, bools=True,
+                               random_state=0)
+    assert np.array_equal(selected, kept[mask])
+    assert list(pipeline.fit_transform(X, y).columns) == \
+        list(X.columns[kept[mask]])
+
+    # Labels are recognised whatever the stage returning them
+    def named(X, y):
+        return list(X.columns[1::2])
+
+    pipeline = SelectionPipeline() \
+        .add('filter', select_k_best, k=10) \
+        .add('rfe', partial(recursive_feature_elimination, weakest),
+             n_features_to_select=5) \
+        .add('named', named)
+    selected = pipeline.fit(X, y).selected_
+    assert np.array_equal(selected, kept[1::2])
+
+    # Including integer labels from recursive_feature_elimination
+    X.columns = range(100, 120)
+    pipeline = SelectionPipeline() \
+        .add('filter', select_k_best, k=10) \
+        .add('rfe', partial(recursive_feature_elimination, weakest),
+             n_features_to_select=5)
+    assert np.array_equal(pipeline.fit(X, y).selected_, kept)
+
+
+def test_pipeline_views():
+    """
+    Test that X is only copied for stages given non-contiguous columns
+    """
+    X = np.arange(60.).reshape(6, 10)
+    seen = []
+
+    def first(X, y):
+        seen.append(X)
+        return np.arange(2, 8)
+
+    def second(X):
+        seen.append(X)
+        return [0, 2, 4]
+
+    def third(data):
+        seen.append(data)
+        return np.array([False, True, True])
+
+    pipeline = SelectionPipeline() \
+        .add('first', first) \
+        .add('second', second) \
+        .add('third', third)
+    pipeline.fit(X)
+
+    assert seen[0] is X
+    assert np.shares_memory(seen[1], X) and seen[1].shape == (6, 6)
+    assert not np.shares_memory(seen[2], X)
+    assert np.array_equal(seen[2], X[:, [2, 4, 6]])
+    assert np.array_equal(pipeline.selected_, [4, 6])
+
+
+def test_pipeline_empty_stage():
+    """
+    Test that stages after one keeping no features are skipped
+    """
+    X, y = make_friedman1(n_samples=50, n_features=5, random_state=0)
+    pipeline = SelectionPipeline() \
+        .add('variance', variance_thresholding, threshold=10) \
+        .add('forward', forward_selection, scorer=scorer)
+
+    assert len(pipeline.fit(X, y).selected_) == 0
+    assert list(pipeline.report()['n_features_out']) == [0, 0]
+
+
+def test_pipeline_parameters():
+    """
+    Test for valid stages and inputs
+    """
+    pipeline = SelectionPipeline().add('variance', variance_thresholding)
+
+    with pytest.raises(TypeError):
+        pipeline.add('scorer', 'not a function')
+
+    with pytest.raises(ValueError):
+        pipeline.add('variance', variance_thresholding)
+
+    with pytest.raises(ValueError):
+        pipeline.report()
+
+    with pytest.raises(ValueError):
+        pipeline.transform(np.ones((2, 2)))
+
+    with pytest.raises(TypeError):
+        pipeline.fit('a string!')
+
+    with pytest.raises(ValueError):
+        pipeline.fit(np.ones(3))
+
+    with pytest.raises(ValueError):
+        SelectionPipeline().add('mask', lambda X: [True]) \
+            .fit(np.ones((2, 2)))
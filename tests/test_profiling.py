@@ -0,0 +1,113 @@
+import numpy as np
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression
+
+from feature_selection import ProfileCollector, ScoreCache, \
+    forward_selection, recursive_feature_elimination, simulated_annealing
+from feature_selection.profiling import ScorerCall
+
+
+def scorer(X, y):
+    """
+    Sample custom scorer that fits a model and returns
+    an appropriate score for the feature selection problem.
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        Test samples
+    y : array-like of shape (n_samples,) or (n_samples, n_outputs)
+        True values for X, used for training
+    Returns
+    -------
+    Error of scorer
+    """
+    lr = LinearRegression().fit(X, y)
+    return 1 - lr.score(X, y)
+
+
+def rfe_scorer(X, y):
+    """
+    Sample custom scorer returning the feature column with the lowest
+    weight.
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return X.columns[model.coef_.argmin()]
+
+
+X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+
+
+def test_forward_selection_profile():
+    """
+    Test that every scorer call of forward selection is reported, serially
+    and in parallel, and that reporting does not change the result
+    """
+    expected = forward_selection(scorer, X, y, 3, 6)
+
+    for n_jobs in [None, 2]:
+        profile = ProfileCollector()
+        features = forward_selection(scorer, X, y, 3, 6, n_jobs=n_jobs,
+                                     callback=profile)
+        assert features == expected
+
+        calls = profile.calls
+        assert all(isinstance(call, ScorerCall) for call in calls)
+        # Step j scores every unselected feature with j + 1 features
+        steps = [call.step for call in calls]
+        assert steps == sorted(steps)
+        assert len(calls) == sum(10 - j for j in range(max(steps) + 1))
+        assert all(call.n_features == call.step + 1 for call in calls)
+        assert all(call.duration >= 0 for call in calls)
+
+    # Cached subsets are not scorer calls
+    cache = ScoreCache()
+    forward_selection(scorer, X, y, 3, 6, cache=cache)
+    profile = ProfileCollector()
+    forward_selection(scorer, X, y, 3, 6, cache=cache, callback=profile)
+    assert profile.calls == []
+
+
+def test_rfe_and_annealing_profile():
+    """
+    Test the steps and subset sizes reported by recursive feature
+    elimination and simulated annealing
+    """
+    profile = ProfileCollector()
+    recursive_feature_elimination(rfe_scorer, X, y, 5, callback=profile)
+    assert [call.step for call in profile.calls] == [0, 1, 2, 3, 4]
+    assert [call.n_features for call in profile.calls] == [10, 9, 8, 7, 6]
+
+    profile.clear()
+    expected = simulated_annealing(scorer, X, y, iterations=20,
+                                   random_state=0, n_chains=2)
+    features = simulated_annealing(scorer, X, y, iterations=20,
+                                   random_state=0, n_chains=2,
+                                   executor='thread', n_jobs=2,
+                                   callback=profile)
+    np.testing.assert_array_equal(features, expected)
+
+    frame = profile.to_frame()
+    assert sorted(frame['chain'].unique()) == [0, 1]
+    assert frame.groupby('chain')['step'].min().tolist() == [0, 0]
+    assert frame['step'].max() <= 20
+    assert (frame['n_features'] >= 1).all()
+
+
+def test_profile_summary():
+    """
+    Test that the summary has one row per selector
+    """
+    profile = ProfileCollector()
+    forward_selection(scorer, X, y, 3, 6, callback=profile)
+    forward_selection('linear', X, y, 3, 6, callback=profile)
+    recursive_feature_elimination(rfe_scorer, X, y, 5, callback=profile)
+
+    summary = profile.summary()
+    assert summary.index.tolist() == ['forward_selection',
+                                      'recursive_feature_elimination']
+    assert summary['calls'].sum() == len(profile.calls)
+    assert summary.loc['recursive_feature_elimination', 'calls'] == 5
+    assert summary.loc['recursive_feature_elimination',
+                       'mean_n_features'] == 8
+    assert (summary['max_latency'] >= summary['mean_latency']).all()
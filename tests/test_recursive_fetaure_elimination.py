@@ -4,7 +4,8 @@ import pytest
 from sklearn.datasets import make_friedman1
 from sklearn.linear_model import LinearRegression
 
-from feature_selection import recursive_feature_elimination
+from feature_selection import ScoreCache, forward_selection, \
+    recursive_feature_elimination
 
 
 def scorer(X, y):
@@ -122,3 +123,184 @@ def test_rfe_parameters():
                                       two_d_array,
                                       np.array([0, 1]),
                                       n_features_to_select=10)
+
+
+def test_rfe_memmap(tmp_path):
+    """
+    Test memory-mapped inputs and paths to .npy files
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    np.save(tmp_path / 'X.npy', X)
+
+    features = recursive_feature_elimination(scorer, tmp_path / 'X.npy', y,
+                                             n_features_to_select=4)
+    assert features == [0, 1, 3, 4]
+
+
+def ranking_scorer(X, y):
+    """
+    Sample custom scorer returning one importance per feature column.
+    """
+    model = LinearRegression()
+    model.fit(X, y)
+    return model.coef_
+
+
+def test_rfe_step():
+    """
+    Test eliminating several features per round with a scorer that
+    returns importances
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    calls = []
+
+    def counting_scorer(X, y):
+        calls.append(X.shape[1])
+        return ranking_scorer(X, y)
+
+    # One feature per round matches the label protocol
+    features = recursive_feature_elimination(ranking_scorer, X, y, 4)
+    assert features == [0, 1, 3, 4]
+
+    features = recursive_feature_elimination(counting_scorer, X, y, 4,
+                                             step=4)
+    assert len(features) == 4
+    assert calls == [10, 6]
+
+    calls.clear()
+    features = recursive_feature_elimination(counting_scorer, X, y, 2,
+                                             step=0.5)
+    assert len(features) == 2
+    assert calls == [10, 5, 3]
+
+    # Default selects half of the features
+    assert len(recursive_feature_elimination(scorer, X, y)) == 5
+
+    # A label can only eliminate one feature per round
+    with pytest.raises(ValueError):
+        recursive_feature_elimination(scorer, X, y, 4, step=2)
+
+    with pytest.raises(ValueError):
+        recursive_feature_elimination(
+            lambda X, y: np.zeros(3), X, y, 4, step=2)
+
+    for step in [0, -1, 1.5, 0.0, '2']:
+        with pytest.raises(ValueError):
+            recursive_feature_elimination(ranking_scorer, X, y, 4,
+                                          step=step)
+
+
+def test_rfe_inputs_agree(tmp_path):
+    """
+    Test that arrays, memory maps and DataFrames give the scorer the same
+    columns and eliminate the same features, including on ties
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    X[:, 7] = X[:, 2]
+    np.save(tmp_path / 'X.npy', X)
+    seen = []
+
+    def recording_scorer(X, y):
+        seen.append(list(X.columns))
+        importances = np.abs(ranking_scorer(X, y))
+        return np.round(importances, 1)
+
+    inputs = [X, np.load(tmp_path / 'X.npy', mmap_mode='r'),
+              pd.DataFrame(X)]
+    results = []
+    for data in inputs:
+        seen.clear()
+        results.append((recursive_feature_elimination(
+            recording_scorer, data, y, 3, step=2), list(seen)))
+
+    assert results[0] == results[1] == results[2]
+
+    # The original data is left untouched
+    assert np.array_equal(X, np.load(tmp_path / 'X.npy'))
+
+
+def test_rfe_checkpoint(tmp_path):
+    """
+    Test resuming an interrupted run from its checkpoint
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    X = pd.DataFrame(X, columns=['zero', 'one', 'two', 'three', 'four',
+                                 'five', 'six', 'seven', 'eight', 'nine'])
+    path = tmp_path / 'checkpoint.json'
+    calls = []
+
+    def interrupted_scorer(X, y):
+        calls.append(X.shape[1])
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return scorer(X, y)
+
+    with pytest.raises(KeyboardInterrupt):
+        recursive_feature_elimination(interrupted_scorer, X, y, 4,
+                                      checkpoint=path)
+
+    calls.clear()
+    features = recursive_feature_elimination(interrupted_scorer, X, y, 4,
+                                             checkpoint=path,
+                                             resume_from=path)
+    assert features == ['zero', 'one', 'three', 'four']
+    assert calls == [7, 6, 5]
+
+    # The checkpoint must come from the same selector
+    with pytest.raises(ValueError):
+        forward_selection(lambda X, y: 0, X.to_numpy(), y,
+                          resume_from=path)
+
+
+def test_rfe_sparse():
+    """
+    Test that sparse matrices give the same result as dense arrays, with
+    scorers returning a position or importances
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    expected = recursive_feature_elimination(scorer, X, y, 5)
+
+    def position_scorer(X, y):
+        assert sparse.issparse(X)
+        return LinearRegression().fit(X, y).coef_.argmin()
+
+    for scorer_ in [position_scorer, ranking_scorer]:
+        features = recursive_feature_elimination(
+            scorer_, sparse.csr_matrix(X), y, 5)
+        assert features == expected
+
+
+def test_rfe_column_order():
+    """
+    Test that cached importances apply to the right columns whatever the
+    order in which the scorer was handed them
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=0)
+
+    expected = recursive_feature_elimination(ranking_scorer, X, y, 4)
+    cache = ScoreCache()
+    recursive_feature_elimination(ranking_scorer, X, y, 4, cache=cache,
+                                  step=3)
+    assert recursive_feature_elimination(ranking_scorer, X, y, 4,
+                                         cache=cache) == expected
+    assert cache.hits > 0
+
+    # Importances are cached in the order of the original columns,
+    # although the scorer was handed them in another order
+    weights = np.random.default_rng(0).permutation(10).astype(float)
+    seen = []
+
+    def weighted_scorer(X, y):
+        seen.append(list(X.columns))
+        return weights[X.columns]
+
+    cache = ScoreCache()
+    recursive_feature_elimination(weighted_scorer, X, y, 4, cache=cache)
+    assert any(columns != sorted(columns) for columns in seen)
+
+    fingerprint = cache.fingerprint(X, y, weighted_scorer)
+    for columns in seen:
+        mask = np.isin(np.arange(10), columns)
+        assert np.array_equal(cache.get(mask, None, fingerprint),
+                              weights[mask])
@@ -0,0 +1,255 @@
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_friedman1
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold, cross_val_score
+
+from feature_selection import Budget, ScoreCache, forward_selection, \
+    simulated_annealing
+from feature_selection.scoring import _take_rows, batched, cv_scorer, \
+    incremental
+
+
+def scorer(X, y):
+    """
+    Sample custom scorer returning the training error of a linear model.
+    """
+    lr = LinearRegression().fit(X, y)
+    return 1 - lr.score(X, y)
+
+
+@batched
+def batch_scorer(X, y, masks):
+    """
+    Sample batched scorer scoring every subset like `scorer`.
+    """
+    return [scorer(X[:, mask], y) for mask in masks]
+
+
+def test_cv_scorer():
+    """
+    Test the cross-validated scorer against scikit-learn
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+
+    for shuffle in [False, True]:
+        folds = KFold(5)
+        scorer = cv_scorer(LinearRegression(), shuffle=shuffle,
+                           random_state=0)
+        score = scorer(X, y)
+
+        if not shuffle:
+            expected = 1 - cross_val_score(LinearRegression(), X, y,
+                                           cv=folds).mean()
+            assert score == pytest.approx(expected)
+
+        # Reused buffers give the same scores on other subsets
+        assert scorer(X[:, :3], y) != score
+        assert scorer(X, y) == score
+
+    # Folds fitted serially or in parallel agree
+    serial = cv_scorer(LinearRegression(), n_jobs=1)
+    parallel = cv_scorer(LinearRegression(), n_jobs=3)
+    assert serial(X[:, [0, 3]], y) == pytest.approx(
+        parallel(X[:, [0, 3]], y))
+
+    scorer = cv_scorer(LinearRegression(), n_splits=2,
+                       metric=mean_squared_error)
+    assert scorer(X, y) > 0
+
+    with pytest.raises(ValueError):
+        cv_scorer(LinearRegression(), n_splits=1)
+
+    with pytest.raises(TypeError):
+        cv_scorer(LinearRegression(), metric='mse')
+
+    with pytest.raises(ValueError):
+        cv_scorer(LinearRegression(), n_splits=5)(X[:3], y[:3])
+
+
+def test_take_rows():
+    """
+    Test that fold rows are gathered into the reused buffers without
+    allocating
+    """
+    X = np.random.default_rng(0).normal(size=(10000, 50))
+    rows = np.arange(0, 10000, 2)
+
+    for data in [X, np.asfortranarray(X), X[:, ::2]]:
+        buffers = threading.local()
+        assert np.array_equal(_take_rows(buffers, 'train', data, rows),
+                              data[rows])
+
+        tracemalloc.start()
+        out = _take_rows(buffers, 'train', data, rows)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        assert np.array_equal(out, data[rows])
+        if data.flags.c_contiguous or data.flags.f_contiguous:
+            assert peak < out.nbytes / 100
+
+
+def test_cv_scorer_threads():
+    """
+    Test that the thread pool of a scorer is shut down when it is closed
+    or garbage collected
+    """
+    X, y = make_friedman1(n_samples=100, n_features=5, random_state=0)
+    threads = set(threading.enumerate())
+
+    for _ in range(10):
+        scorer = cv_scorer(LinearRegression())
+        scorer(X, y)
+        assert set(threading.enumerate()) - threads
+    del scorer
+
+    scorer = cv_scorer(LinearRegression())
+    scorer(X, y)
+    scorer.close()
+    with pytest.raises(ValueError):
+        scorer(X, y)
+
+    # Threads of the pools of earlier tests may stop meanwhile, so only
+    # the ones started here are counted
+    for _ in range(50):
+        if not set(threading.enumerate()) - threads:
+            break
+        time.sleep(0.01)
+    assert not set(threading.enumerate()) - threads
+
+
+def test_cv_scorer_with_selectors():
+    """
+    Test the cross-validated scorer inside the selectors
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    scorer = cv_scorer(LinearRegression())
+
+    results = forward_selection(scorer, X, y, 4, 4)
+    assert np.array_equal(np.sort(results), [0, 1, 3, 4])
+    assert forward_selection(scorer, X, y, 4, 4, n_jobs=3) == results
+
+    features = simulated_annealing(scorer, X, y, iterations=20,
+                                   random_state=0, n_chains=2, n_jobs=2,
+                                   executor='thread')
+    assert len(features) > 0
+
+
+def test_batched_scorer():
+    """
+    Test that batched scorers give the same results as one call per
+    subset, and that they are called once per step or iteration
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    batches = []
+
+    @batched
+    def counting_scorer(X, y, masks):
+        batches.append(len(masks))
+        return batch_scorer(X, y, masks)
+
+    expected = forward_selection(scorer, X, y, 3, 6)
+    assert forward_selection(counting_scorer, X, y, 3, 6) == expected
+    assert batches == [10, 9, 8, 7, 6]
+
+    # Cached subsets are left out of the batch
+    cache = ScoreCache()
+    forward_selection(counting_scorer, X, y, 2, 2, cache=cache)
+    batches.clear()
+    forward_selection(counting_scorer, X, y, 3, 6, cache=cache)
+    assert batches == [8, 7, 6]
+
+    # max_calls counts subsets, not batches
+    batches.clear()
+    features = forward_selection(counting_scorer, X, y, 3, 6,
+                                 budget=Budget(max_calls=25))
+    assert features == expected[:2]
+    assert batches == [10, 9, 6]
+
+    # A batch of one proposal is the usual annealing
+    expected = simulated_annealing(scorer, X, y, iterations=20,
+                                   random_state=0)
+    features = simulated_annealing(batch_scorer, X, y, iterations=20,
+                                   random_state=0)
+    assert np.array_equal(features, expected)
+
+    batches.clear()
+    simulated_annealing(counting_scorer, X, y, iterations=20,
+                        random_state=0, batch_size=4)
+    assert batches[0] == 1
+    assert len(batches) == 21
+    assert all(size <= 4 for size in batches)
+
+    with pytest.raises(ValueError):
+        simulated_annealing(scorer, X, y, batch_size=0)
+
+    @batched
+    def bad_scorer(X, y, masks):
+        return [0.5]
+
+    with pytest.raises(ValueError):
+        forward_selection(bad_scorer, X, y, 3, 6)
+
+
+def test_incremental_scorer():
+    """
+    Test that incremental scorers are given the columns added and
+    removed since their last state
+    """
+    X, y = make_friedman1(n_samples=200, n_features=20, random_state=10)
+    calls = []
+
+    @incremental
+    def delta_scorer(X, y, mask, state, added, removed):
+        previous = np.zeros(X.shape[1], dtype=bool) if state is None \
+            else state.copy()
+        previous[added] = True
+        previous[removed] = False
+        assert np.array_equal(previous, mask)
+        calls.append(len(added) + len(removed))
+        return scorer(X[:, mask], y), mask.copy()
+
+    expected = simulated_annealing(scorer, X, y, iterations=30,
+                                   random_state=0)
+    features = simulated_annealing(delta_scorer, X, y, iterations=30,
+                                   random_state=0)
+    assert np.array_equal(features, expected)
+
+    # After the first fit from scratch, each proposal flips
+    # ceil(5% of 20) = 1 column
+    assert calls[0] > 1
+    assert all(n_changes == 1 for n_changes in calls[1:])
+
+    # States follow the features exchanged between replicas
+    simulated_annealing(delta_scorer, X, y, iterations=30, random_state=0,
+                        temperatures=[1, 4], swap_interval=5,
+                        batch_size=2)
+
+    with pytest.raises(TypeError):
+        forward_selection(delta_scorer, X, y, 3, 6)
+
+    with pytest.raises(TypeError):
+        simulated_annealing(batched(delta_scorer), X, y)
+
+
+def test_annealing_workspace():
+    """
+    Test that proposals are gathered into a reused workspace
+    """
+    X, y = make_friedman1(n_samples=200, n_features=20, random_state=10)
+    buffers = set()
+
+    def checked_scorer(X_subset, y):
+        base = X_subset.base if X_subset.base is not None else X_subset
+        buffers.add(id(base))
+        assert X_subset.flags['C_CONTIGUOUS']
+        return scorer(X_subset, y)
+
+    simulated_annealing(checked_scorer, X, y, iterations=50, random_state=0)
+    assert len(buffers) <= 3
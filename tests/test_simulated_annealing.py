@@ -1,9 +1,14 @@
+import pickle
+
 import numpy as np
 import pytest
 from sklearn.datasets import make_friedman1
 from sklearn.linear_model import LinearRegression
 
 from feature_selection import simulated_annealing
+from feature_selection._parallel import _executor_scope
+from feature_selection.simulated_annealing import _Annealing, _Chain, \
+    _exchange, _run_chain
 
 
 def scorer(X, y):
@@ -107,3 +112,124 @@ def test_sa_parameters():
     # X and y must have consistent number of samples
     with pytest.raises(ValueError):
         simulated_annealing(scorer, two_d_array, np.array([0, 1, 2]), 1)
+
+
+def test_sa_chains():
+    """
+    Test running several independent chains
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+
+    # Seeded runs are reproducible and leave the global state alone
+    np.random.seed(0)
+    expected_draw = np.random.random()
+    np.random.seed(0)
+    first = simulated_annealing(scorer, X, y, random_state=1)
+    assert np.random.random() == expected_draw
+    second = simulated_annealing(scorer, X, y, random_state=1)
+    assert np.array_equal(first, second)
+
+    features, traces = simulated_annealing(scorer, X, y, iterations=20,
+                                           random_state=1, n_chains=3,
+                                           return_traces=True)
+    assert len(traces) == 3
+    assert all(len(trace) == 21 for trace in traces)
+    best = min(trace[-1] for trace in traces)
+    assert scorer(X[:, features], y) == pytest.approx(best)
+
+    # Chains run in parallel give the same result as serial chains
+    for executor in ['process', 'thread']:
+        parallel = simulated_annealing(scorer, X, y, iterations=20,
+                                       random_state=1, n_chains=3,
+                                       n_jobs=2, executor=executor)
+        assert np.array_equal(parallel, features)
+
+    with pytest.raises(ValueError):
+        simulated_annealing(scorer, X, y, n_chains=0)
+
+
+def test_sa_tempering():
+    """
+    Test replica exchange between chains at different temperatures
+    """
+    X, y = make_friedman1(n_samples=200, n_features=20, random_state=10)
+    temperatures = [0.5, 1, 2, 4]
+
+    features, traces = simulated_annealing(
+        scorer, X, y, iterations=40, random_state=1,
+        temperatures=temperatures, swap_interval=5, return_traces=True)
+    assert len(traces) == 4
+    assert all(len(trace) == 41 for trace in traces)
+
+    # The best features seen by any replica are returned
+    best = scorer(X[:, features], y)
+    assert best <= min(trace.min() for trace in traces) + 1e-12
+
+    # Replicas run in parallel exchange features exactly like serial ones
+    for executor in ['process', 'thread']:
+        parallel = simulated_annealing(
+            scorer, X, y, iterations=40, random_state=1,
+            temperatures=temperatures, swap_interval=5, n_jobs=2,
+            executor=executor)
+        assert np.array_equal(parallel, features)
+
+    # Process pools get the data once per worker, not every segment
+    annealing = _Annealing(scorer, X, y, 1, 40)
+    chain = _Chain(annealing, 0, 1)
+    with _executor_scope(2, 'process', annealing) as pool:
+        assert len(pickle.dumps(annealing)) < 200
+        chain = pool.submit(_run_chain, annealing, chain, 5).result()
+    assert chain.i == 5
+    assert len(pickle.dumps(annealing)) > X.nbytes
+
+    with pytest.raises(ValueError):
+        simulated_annealing(scorer, X, y, temperatures=[1, 2], n_chains=2)
+
+    with pytest.raises(ValueError):
+        simulated_annealing(scorer, X, y, temperatures=[0, 1])
+
+    with pytest.raises(ValueError):
+        simulated_annealing(scorer, X, y, temperatures=[1, 2],
+                            swap_interval=0)
+
+
+def test_exchange():
+    """
+    Test that replicas swap features when the colder one is worse
+    """
+    X, y = make_friedman1(n_samples=50, n_features=5, random_state=10)
+    annealing = _Annealing(scorer, X, y, 1, 10)
+    cold = _Chain(annealing, 0, 1)
+    hot = _Chain(annealing, 1, 10)
+    cold.ftr_old, cold.score_old = np.array([True] * 5), 0.8
+    hot.ftr_old, hot.score_old = np.array([False] * 4 + [True]), 0.2
+
+    _exchange([cold, hot], 10, 0, np.random.default_rng(0))
+    assert cold.score_old == 0.2 and hot.score_old == 0.8
+    assert cold.ftr_old.sum() == 1
+
+
+def test_sa_memmap(tmp_path):
+    """
+    Test memory-mapped inputs and paths to .npy files
+    """
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    expected = simulated_annealing(scorer, X, y, random_state=2)
+    np.save(tmp_path / 'X.npy', X)
+
+    features = simulated_annealing(scorer, tmp_path / 'X.npy', y,
+                                   random_state=2)
+    assert np.array_equal(features, expected)
+
+
+def test_sa_sparse():
+    """
+    Test that sparse matrices give the same result as dense arrays
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    X, y = make_friedman1(n_samples=200, n_features=10, random_state=10)
+    expected = simulated_annealing(scorer, X, y, random_state=2)
+
+    features = simulated_annealing(scorer, sparse.csr_matrix(X), y,
+                                   random_state=2)
+    assert np.array_equal(features, expected)
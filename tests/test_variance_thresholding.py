@@ -57,3 +57,111 @@ def test_invalid_data_dim_exception():
         assert variance_thresholding(
             [[[1, 2, 3], [1, 2, 3]], [[1, 2, 3], [1, 2, 3]]]
         )
+
+
+def test_streaming_support(tmp_path):
+    """
+    Test that streaming row chunks selects the same features as the
+    whole data
+    """
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(1000, 6)) * [0.1, 1, 2, 0.5, 0, 3]
+    data[:, 4] = 0.1
+    data[rng.random(data.shape) < 0.05] = np.nan
+
+    for threshold in [0, 0.05, 1]:
+        expected = variance_thresholding(data, threshold)
+        chunks = (data[start:start + 64] for start in range(0, 1000, 64))
+        result = variance_thresholding(chunks, threshold)
+        assert np.array_equal(result, expected)
+
+    # The constant column is dropped
+    assert 4 not in variance_thresholding(data)
+
+    # DataFrames, including chunked CSV readers
+    iris_copy = pd.DataFrame.copy(iris)
+    iris_copy['fake_num'] = np.zeros(iris_copy.shape[0])
+    iris_copy['fake_categorical'] = 'abcde'
+    path = tmp_path / 'iris.csv'
+    iris_copy.to_csv(path, index=False)
+
+    result = variance_thresholding(pd.read_csv(path, chunksize=40))
+    assert np.array_equal(result, [0, 1, 2, 3, 5])
+
+    # Lists of rows
+    chunks = iter([[[1, 6, 0, 5]], [[1, 2, 4, 5], [1, 7, 8, 5]]])
+    assert np.array_equal(variance_thresholding(chunks), [1, 2])
+
+    assert len(variance_thresholding(iter([]))) == 0
+
+    with pytest.raises(ValueError):
+        variance_thresholding(iter([[[1, 2]], [[1, 2, 3]]]))
+
+    with pytest.raises(TypeError):
+        variance_thresholding(iter(['123']))
+
+
+def test_memmap_support(tmp_path):
+    """
+    Test memory maps and paths to .npy files
+    """
+    data = np.array([[1, 6, 0, 5], [1, 2, 4, 5], [1, 7, 8, 5]],
+                    dtype=np.float32)
+    path = tmp_path / 'data.npy'
+    np.save(path, data)
+
+    assert np.array_equal(variance_thresholding(path), [1, 2])
+    assert np.array_equal(variance_thresholding(str(path)), [1, 2])
+    memmap = np.load(path, mmap_mode='r')
+    assert np.array_equal(variance_thresholding(memmap), [1, 2])
+
+
+def test_duplicate_column_names():
+    """
+    Test that columns are selected by position, not by name
+    """
+    data = pd.DataFrame([[1, 6, 0, 'a'], [1, 2, 4, 'b'], [1, 7, 8, 'c']],
+                        columns=['x', 'x', 'y', 'y'])
+
+    assert np.array_equal(variance_thresholding(data), [1, 2, 3])
+
+
+def test_array_fast_path():
+    """
+    Test numerical arrays of various dtypes against NumPy's variance
+    """
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(50, 20)) * rng.random(20)
+
+    for dtype in [np.float64, np.float32]:
+        values = data.astype(dtype)
+        variances = np.var(values, axis=0, ddof=1)
+        threshold = np.median(variances)
+        result = variance_thresholding(values, threshold)
+        assert np.array_equal(result, np.flatnonzero(variances > threshold))
+
+    booleans = np.array([[True, False], [True, True], [True, False]])
+    assert np.array_equal(variance_thresholding(booleans), [1])
+
+
+def test_sparse():
+    """
+    Test that sparse matrices give the same result as dense arrays
+    """
+    sparse = pytest.importorskip('scipy.sparse')
+    data = sparse.random(200, 50, density=0.1, random_state=0, format='lil')
+    data[:, 7] = 2.0
+    data[3, 4] = np.nan
+    dense = data.toarray()
+
+    for matrix in [data.tocsr(), data.tocsc(), sparse.csr_array(data)]:
+        for threshold in [0, 0.01]:
+            assert np.array_equal(variance_thresholding(matrix, threshold),
+                                  variance_thresholding(dense, threshold))
+
+    # The caller's matrix is left as it was, duplicates included
+    coo = sparse.coo_matrix(
+        ([1.0, 2.0, 3.0, 4.0], ([0, 1, 1, 2], [0, 1, 1, 0])), shape=(3, 2))
+    rows = coo.row.copy()
+    assert np.array_equal(variance_thresholding(coo), [0, 1])
+    assert coo.nnz == 4 and np.array_equal(coo.row, rows)